@@ -2,9 +2,11 @@ import os
 import sys
 
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 
+from tools.pali_sort_key import pali_collation
+
 
 def get_db_session(db_path: Path) -> Session:
     """Get the db session."""
@@ -16,6 +18,11 @@ def get_db_session(db_path: Path) -> Session:
         db_eng = create_engine(f"sqlite+pysqlite:///{db_path}", echo=False)
         # db_conn = db_eng.connect()
 
+        # ORDER BY column COLLATE pali sorts in Pāḷi alphabetical order
+        @event.listens_for(db_eng, "connect")
+        def add_pali_collation(dbapi_connection, connection_record):
+            dbapi_connection.create_collation("pali", pali_collation)
+
         Session = sessionmaker(db_eng)
         Session.configure(bind=db_eng)
         db_sess = Session()
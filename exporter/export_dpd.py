@@ -1,12 +1,19 @@
+import multiprocessing
+import pickle
 
+from collections import defaultdict
+from hashlib import md5
+from importlib.metadata import version
+from pathlib import Path
 from minify_html import minify
 from rich import print
-from typing import List
+from typing import Dict, List, Tuple
 from sqlalchemy import and_
 from css_html_js_minify import css_minify, js_minify
 
-from db.models import PaliWord, DerivedData
+from db.models import PaliWord, PaliRoot, DerivedData
 from db.models import FamilyRoot, FamilyWord
+from db.models import FamilyCompound, FamilySet
 from html_components import render_header_tmpl
 from html_components import render_dpd_defintion_templ
 from html_components import render_button_box_templ
@@ -19,12 +26,25 @@ from html_components import render_family_compound_templ
 from html_components import render_family_sets_templ
 from html_components import render_frequency_templ
 from html_components import render_feedback_templ
+from html_components import TODAY
+from helpers import CF_SET
 from tools.niggahitas import add_niggahitas
 from tools.tic_toc import bip, bop
 
+# render entries across a process pool,
+# with output identical to rendering them one by one
+multiprocess_on = True
+processes = multiprocessing.cpu_count()
+chunk_size = 1000
+
+# reuse the html of unchanged entries from the last export
+render_cache_on = True
+
+render_data: dict = {}
 
-def generate_dpd_html(DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict):
-    print("[green]generating dpd html")
+
+def make_dpd_resources(PTH) -> Dict[str, str]:
+    """the minified css and js of every dpd entry, keyed by file name"""
 
     with open(PTH.dpd_css_path) as f:
         dpd_css = f.read()
@@ -35,6 +55,26 @@ def generate_dpd_html(DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict):
         button_js = f.read()
     button_js = js_minify(button_js)
 
+    return {"dpd.css": dpd_css, "dpd.js": button_js}
+
+
+def generate_dpd_html(
+        DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict,
+        shared_resources: bool = False):
+    """shared_resources links every entry to dpd.css and dpd.js,
+    which the exporters add as resource files, instead of inlining them"""
+
+    print("[green]generating dpd html")
+
+    dpd_resources = make_dpd_resources(PTH)
+
+    if shared_resources is True:
+        header = render_header_tmpl(
+            css="", js="", css_href="dpd.css", js_href="dpd.js")
+    else:
+        header = render_header_tmpl(
+            dpd_resources["dpd.css"], dpd_resources["dpd.js"])
+
     dpd_data_list: List[dict] = []
 
     dpd_db = (
@@ -55,6 +95,13 @@ def generate_dpd_html(DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict):
     )
 
     dpd_length = len(dpd_db)
+
+    # compound families and sets, loaded once instead of queried per word
+    fc_dict: Dict[str, FamilyCompound] = {
+        fc.compound_family: fc for fc in DB_SESSION.query(FamilyCompound)}
+    fs_dict: Dict[str, FamilySet] = {
+        fs.set: fs for fs in DB_SESSION.query(FamilySet)}
+
     size_dict["dpd_header"] = 0
     size_dict["dpd_summary"] = 0
     size_dict["dpd_button_box"] = 0
@@ -69,10 +116,9 @@ def generate_dpd_html(DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict):
     size_dict["dpd_feedback"] = 0
     size_dict["dpd_synonyms"] = 0
 
-    bip()
-    for counter, (i, dd, fr, fw) in enumerate(dpd_db):
-
-        # replace \n with html line break
+    # replace \n with html line break.
+    # done up front, so the session's objects match in both render modes
+    for i, dd, fr, fw in dpd_db:
         i.meaning_1 = i.meaning_1.replace("\n", "<br>")
         i.sanskrit = i.sanskrit.replace("\n", "<br>")
         i.phonetic = i.phonetic.replace("\n", "<br>")
@@ -84,83 +130,296 @@ def generate_dpd_html(DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict):
         i.example_1 = i.example_1.replace("\n", "<br>")
         i.example_2 = i.example_2.replace("\n", "<br>")
 
-        html: str = ""
-        header = render_header_tmpl(dpd_css, button_js)
-        html += header
-        size_dict["dpd_header"] += len(header)
-
-        html += "<body>"
-
-        summary = render_dpd_defintion_templ(i)
-        html += summary
-        size_dict["dpd_summary"] += len(summary)
-
-        button_box = render_button_box_templ(i)
-        html += button_box
-        size_dict["dpd_button_box"] += len(button_box)
-
-        grammar = render_grammar_templ(i)
-        html += grammar
-        size_dict["dpd_grammar"] += len(grammar)
-
-        example = render_example_templ(i)
-        html += example
-        size_dict["dpd_example"] += len(example)
-
-        inflection_table = render_inflection_templ(i, dd)
-        html += inflection_table
-        size_dict["dpd_inflection_table"] += len(inflection_table)
-
-        family_root = render_family_root_templ(i, fr)
-        html += family_root
-        size_dict["dpd_family_root"] += len(family_root)
-
-        family_word = render_family_word_templ(i, fw)
-        html += family_word
-        size_dict["dpd_family_word"] += len(family_word)
-
-        family_compound = render_family_compound_templ(i, DB_SESSION)
-        html += family_compound
-        size_dict["dpd_family_compound"] += len(family_compound)
-
-        family_sets = render_family_sets_templ(i, DB_SESSION)
-        html += family_sets
-        size_dict["dpd_family_sets"] += len(family_sets)
-
-        frequency = render_frequency_templ(i, dd)
-        html += frequency
-        size_dict["dpd_frequency"] += len(frequency)
-
-        feedback = render_feedback_templ(i)
-        html += feedback
-        size_dict["dpd_feedback"] += len(feedback)
-
-        html += "</body></html>"
-        html = minify(html)
-
-        synonyms: list = dd.inflections_list
-        synonyms = add_niggahitas(synonyms)
-        for synonym in synonyms:
-            if synonym in SANDHI_CONTRACTIONS:
-                contractions = SANDHI_CONTRACTIONS[synonym]["contractions"]
-                synonyms.extend(contractions)
-        synonyms += dd.sinhala_list
-        synonyms += dd.devanagari_list
-        synonyms += dd.thai_list
-        synonyms += i.family_set_list
-        synonyms += [str(i.id)]
-        size_dict["dpd_synonyms"] += len(str(synonyms))
-
-        dpd_data_list += [{
-            "word": i.pali_1,
-            "definition_html": html,
-            "definition_plain": "",
-            "synonyms": synonyms
-        }]
-
-        if counter % 10000 == 0:
-            print(
-                f"{counter:>10,} / {dpd_length:<10,} {i.pali_1:<20} {bop():>10}")
-            bip()
+    # everything the workers need, inherited when they fork
+    global render_data
+    render_data = {
+        "dpd_db": dpd_db,
+        "header": header,
+        "fc_dict": fc_dict,
+        "fs_dict": fs_dict,
+        "sandhi_contractions": SANDHI_CONTRACTIONS,
+    }
+
+    # reuse the cached html of every entry whose inputs haven't changed
+    if render_cache_on is True:
+        entry_hashes = [
+            make_entry_hash(
+                i, dd, fr, fw, fc_dict, fs_dict, SANDHI_CONTRACTIONS)
+            for i, dd, fr, fw in dpd_db]
+        global_hash = make_global_hash(PTH, header)
+        cache = load_render_cache(PTH, global_hash)
+        to_render = [
+            n for n, (i, dd, fr, fw) in enumerate(dpd_db)
+            if cache["entries"].get(i.id, ("",))[0] != entry_hashes[n]]
+        reused = dpd_length - len(to_render)
+        print(f"[green]reusing cached html [white]{reused:,}")
+    else:
+        to_render = list(range(dpd_length))
+
+    # index in dpd_db: (data, sizes)
+    rendered: Dict[int, Tuple[dict, dict]] = {}
+    # id: (entry hash, data, sizes), the next cache
+    entries: Dict[int, Tuple[str, dict, dict]] = {}
+
+    bip()
+    if multiprocess_on is True and len(to_render) > chunk_size:
+        # load all the roots before forking, so i.rt never needs the db.
+        # roots_db keeps them in the session's identity map.
+        roots_db = DB_SESSION.query(PaliRoot).all()
+        for i, dd, fr, fw in dpd_db:
+            i.rt
+        print(f"[green]processes [white]{processes}", end=" ")
+        print(f"[green]roots [white]{len(roots_db):,}")
+
+        chunks = [
+            to_render[x:x + chunk_size]
+            for x in range(0, len(to_render), chunk_size)]
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(processes=processes) as pool:
+            for counter, (chunk, chunk_results) in enumerate(zip(
+                    chunks, pool.imap(render_dpd_chunk, chunks))):
+                rendered.update(zip(chunk, chunk_results))
+
+                if counter % 10 == 0:
+                    i = dpd_db[chunk[0]][0]
+                    print(
+                        f"{counter * chunk_size:>10,} / {len(to_render):<10,} {i.pali_1:<20} {bop():>10}")
+                    bip()
+
+    else:
+        for counter, n in enumerate(to_render):
+            i, dd, fr, fw = dpd_db[n]
+            rendered[n] = render_dpd_entry(i, dd, fr, fw)
+
+            if counter % 10000 == 0:
+                print(
+                    f"{counter:>10,} / {len(to_render):<10,} {i.pali_1:<20} {bop():>10}")
+                bip()
+
+    # merge in db order
+    for n, (i, dd, fr, fw) in enumerate(dpd_db):
+        if n in rendered:
+            data, sizes = rendered[n]
+        else:
+            data, sizes = cached_entry(cache, i.id)
+
+        dpd_data_list += [data]
+        for key, value in sizes.items():
+            size_dict[key] += value
+
+        if render_cache_on is True:
+            entries[i.id] = (entry_hashes[n], data, sizes)
+
+    # only the current headwords, so deleted ones drop out of the cache
+    if render_cache_on is True:
+        save_render_cache(PTH, global_hash, entries)
 
     return dpd_data_list, size_dict
+
+
+def render_dpd_chunk(chunk: List[int]) -> List[Tuple[dict, dict]]:
+    """render a chunk of dpd_db indexes in a worker process"""
+
+    dpd_db = render_data["dpd_db"]
+    return [render_dpd_entry(*dpd_db[n]) for n in chunk]
+
+
+def row_values(row) -> tuple:
+    """all the column values of a db row"""
+
+    if row is None:
+        return ()
+    return tuple(
+        getattr(row, column) for column in row.__table__.columns.keys())
+
+
+def make_entry_hash(
+        i: PaliWord,
+        dd: DerivedData,
+        fr: FamilyRoot,
+        fw: FamilyWord,
+        fc_dict: Dict[str, FamilyCompound],
+        fs_dict: Dict[str, FamilySet],
+        SANDHI_CONTRACTIONS: dict) -> str:
+    """hash of everything in the db that feeds into one entry"""
+
+    fc_list = i.family_compound_list + [i.pali_clean]
+    contractions = [
+        SANDHI_CONTRACTIONS[synonym]["contractions"]
+        for synonym in add_niggahitas(dd.inflections_list)
+        if synonym in SANDHI_CONTRACTIONS]
+
+    inputs = (
+        row_values(i),
+        row_values(dd),
+        row_values(fr),
+        row_values(fw),
+        row_values(i.rt),
+        [row_values(fc_dict.get(family)) for family in fc_list],
+        [row_values(fs_dict.get(family)) for family in i.family_set_list],
+        i.pali_clean in CF_SET,
+        contractions,
+    )
+    return md5(repr(inputs).encode()).hexdigest()
+
+
+def make_global_hash(PTH, header: str) -> str:
+    """hash of the header, templates and code shared by every entry,
+    and the versions of the libraries that render and minify it"""
+
+    project_dir = Path(__file__).parents[1]
+    paths = [
+        PTH.header_templ_path,
+        PTH.dpd_definition_templ_path,
+        PTH.button_box_templ_path,
+        PTH.grammar_templ_path,
+        PTH.example_templ_path,
+        PTH.inflection_templ_path,
+        PTH.family_root_templ_path,
+        PTH.family_word_templ_path,
+        PTH.family_compound_templ_path,
+        PTH.family_set_templ_path,
+        PTH.frequency_templ_path,
+        PTH.feedback_templ_path,
+        Path(__file__),
+        Path(__file__).with_name("html_components.py"),
+        Path(__file__).with_name("helpers.py"),
+        # PaliWord properties and the tools the templates call
+        project_dir.joinpath("db/models.py"),
+        project_dir.joinpath("tools/meaning_construction.py"),
+        project_dir.joinpath("tools/superscripter.py"),
+        project_dir.joinpath("tools/pali_sort_key.py"),
+        project_dir.joinpath("tools/pos.py"),
+        project_dir.joinpath("tools/niggahitas.py"),
+    ]
+
+    global_hash = md5(header.encode())
+    for path in paths:
+        global_hash.update(Path(path).read_bytes())
+    for package in ["mako", "minify_html"]:
+        global_hash.update(version(package).encode())
+    return global_hash.hexdigest()
+
+
+def load_render_cache(PTH, global_hash: str) -> dict:
+    """the cache from the last export,
+    or an empty one if anything shared by every entry has changed"""
+
+    try:
+        with open(PTH.dpd_render_cache_path, "rb") as f:
+            cache: dict = pickle.load(f)
+    except FileNotFoundError:
+        cache = {}
+
+    if cache.get("global_hash") != global_hash:
+        cache = {"global_hash": global_hash, "today": "", "entries": {}}
+    return cache
+
+
+def cached_entry(cache: dict, id: int) -> Tuple[dict, dict]:
+    """the cached (data, sizes) of one entry, with today's date"""
+
+    entry_hash, data, sizes = cache["entries"][id]
+    if cache["today"] != str(TODAY):
+        data = dict(
+            data,
+            definition_html=data["definition_html"].replace(
+                cache["today"], str(TODAY)))
+    return data, sizes
+
+
+def save_render_cache(
+        PTH, global_hash: str,
+        entries: Dict[int, Tuple[str, dict, dict]]) -> None:
+    cache = {
+        "global_hash": global_hash, "today": str(TODAY), "entries": entries}
+    with open(PTH.dpd_render_cache_path, "wb") as f:
+        pickle.dump(cache, f)
+
+
+def render_dpd_entry(
+        i: PaliWord,
+        dd: DerivedData,
+        fr: FamilyRoot,
+        fw: FamilyWord) -> Tuple[dict, dict]:
+    """render the html and synonyms of one headword,
+    returns the data and the size of each section"""
+
+    SANDHI_CONTRACTIONS = render_data["sandhi_contractions"]
+    size_dict: dict = defaultdict(int)
+
+    html: str = ""
+    header = render_data["header"]
+    html += header
+    size_dict["dpd_header"] += len(header)
+
+    html += "<body>"
+
+    summary = render_dpd_defintion_templ(i)
+    html += summary
+    size_dict["dpd_summary"] += len(summary)
+
+    button_box = render_button_box_templ(i)
+    html += button_box
+    size_dict["dpd_button_box"] += len(button_box)
+
+    grammar = render_grammar_templ(i)
+    html += grammar
+    size_dict["dpd_grammar"] += len(grammar)
+
+    example = render_example_templ(i)
+    html += example
+    size_dict["dpd_example"] += len(example)
+
+    inflection_table = render_inflection_templ(i, dd)
+    html += inflection_table
+    size_dict["dpd_inflection_table"] += len(inflection_table)
+
+    family_root = render_family_root_templ(i, fr)
+    html += family_root
+    size_dict["dpd_family_root"] += len(family_root)
+
+    family_word = render_family_word_templ(i, fw)
+    html += family_word
+    size_dict["dpd_family_word"] += len(family_word)
+
+    family_compound = render_family_compound_templ(
+        i, render_data["fc_dict"])
+    html += family_compound
+    size_dict["dpd_family_compound"] += len(family_compound)
+
+    family_sets = render_family_sets_templ(i, render_data["fs_dict"])
+    html += family_sets
+    size_dict["dpd_family_sets"] += len(family_sets)
+
+    frequency = render_frequency_templ(i, dd)
+    html += frequency
+    size_dict["dpd_frequency"] += len(frequency)
+
+    feedback = render_feedback_templ(i)
+    html += feedback
+    size_dict["dpd_feedback"] += len(feedback)
+
+    html += "</body></html>"
+    html = minify(html)
+
+    synonyms: list = dd.inflections_list
+    synonyms = add_niggahitas(synonyms)
+    for synonym in synonyms:
+        if synonym in SANDHI_CONTRACTIONS:
+            contractions = SANDHI_CONTRACTIONS[synonym]["contractions"]
+            synonyms.extend(contractions)
+    synonyms += dd.sinhala_list
+    synonyms += dd.devanagari_list
+    synonyms += dd.thai_list
+    synonyms += i.family_set_list
+    synonyms += [str(i.id)]
+    size_dict["dpd_synonyms"] += len(str(synonyms))
+
+    return {
+        "word": i.pali_1,
+        "definition_html": html,
+        "definition_plain": "",
+        "synonyms": synonyms
+    }, dict(size_dict)
@@ -2,11 +2,13 @@
 import zipfile
 import csv
 
+from itertools import chain
 from os import popen
 from rich import print
 from sqlalchemy.orm import Session
+from typing import Iterable
 
-from export_dpd import generate_dpd_html
+from export_dpd import generate_dpd_html, make_dpd_resources
 from export_roots import generate_root_html
 from export_epd import generate_epd_html
 # from export_sandhi import generate_sandhi_html
@@ -26,6 +28,10 @@ tic()
 DB_SESSION: Session = get_db_session("dpd.db")
 SANDHI_CONTRACTIONS: dict = make_sandhi_contraction_dict(DB_SESSION)
 
+# link dpd entries to one shared css and js file,
+# instead of inlining them in every entry
+shared_resources_on = True
+
 
 def main():
     print("[bright_yellow]exporting dpd")
@@ -33,7 +39,8 @@ def main():
 
     roots_count_dict = make_roots_count_dict(DB_SESSION)
     dpd_data_list, size_dict = generate_dpd_html(
-        DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict)
+        DB_SESSION, PTH, SANDHI_CONTRACTIONS, size_dict,
+        shared_resources=shared_resources_on)
     root_data_list, size_dict = generate_root_html(
         DB_SESSION, PTH, roots_count_dict, size_dict)
     variant_spelling_data_list, size_dict = generate_variant_spelling_html(PTH, size_dict)
@@ -41,22 +48,33 @@ def main():
     help_data_list, size_dict = generate_help_html(DB_SESSION, PTH, size_dict)
     DB_SESSION.close()
 
-    combined_data_list: list = (
-        dpd_data_list +
-        root_data_list +
-        variant_spelling_data_list +
-        epd_data_list +
-        help_data_list
-    )
+    # each exporter's list is kept apart, the mdict export
+    # empties them one by one
+    data_lists: list = [
+        dpd_data_list,
+        root_data_list,
+        variant_spelling_data_list,
+        epd_data_list,
+        help_data_list,
+    ]
+    del dpd_data_list, root_data_list, variant_spelling_data_list
+    del epd_data_list, help_data_list
+
+    if shared_resources_on is True:
+        resources = {
+            file_name: data.encode("utf-8")
+            for file_name, data in make_dpd_resources(PTH).items()}
+    else:
+        resources = {}
 
     write_size_dict(size_dict)
-    export_to_goldendict(combined_data_list)
+    export_to_goldendict(chain.from_iterable(data_lists), resources)
     goldendict_unzip_and_copy()
-    export_to_mdict(combined_data_list, PTH)
+    export_to_mdict(data_lists, PTH, resources)
     toc()
 
 
-def export_to_goldendict(data_list: list) -> None:
+def export_to_goldendict(data_list: Iterable, resources: dict) -> None:
     """generate goldedict zip"""
     bip()
 
@@ -69,7 +87,8 @@ def export_to_goldendict(data_list: list) -> None:
             "website": "https://digitalpalidictionary.github.io/", }
     )
 
-    export_words_as_stardict_zip(data_list, ifo, PTH.zip_path, PTH.icon_path)
+    export_words_as_stardict_zip(
+        data_list, ifo, PTH.zip_path, PTH.icon_path, resources)
 
     # add bmp icon for android
     with zipfile.ZipFile(PTH.zip_path, 'a') as zipf:
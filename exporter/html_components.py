@@ -1,5 +1,6 @@
 from mako.template import Template
 from datetime import date
+from typing import Dict
 
 from db.models import PaliWord
 from db.models import PaliRoot
@@ -66,9 +67,12 @@ help_templ = Template(
     filename=str(PTH.help_templ_path))
 
 
-def render_header_tmpl(css: str, js: str) -> str:
-    """render the html header with css and js"""
-    return str(header_tmpl.render(css=css, js=js))
+def render_header_tmpl(
+        css: str, js: str, css_href: str = "", js_href: str = "") -> str:
+    """render the html header with css and js,
+    or with links to shared css and js resource files"""
+    return str(header_tmpl.render(
+        css=css, js=js, css_href=css_href, js_href=js_href))
 
 
 def render_dpd_defintion_templ(i: PaliWord) -> str:
@@ -297,31 +301,25 @@ def render_family_word_templ(i: PaliWord, fw: FamilyWord) -> str:
         return ""
 
 
-def render_family_compound_templ(i: PaliWord, DB_SESSION) -> str:
-    """render html table of all words containing the same compound"""
+def render_family_compound_templ(
+        i: PaliWord, fc_dict: Dict[str, FamilyCompound]) -> str:
+    """render html table of all words containing the same compound.
+    fc_dict is every FamilyCompound keyed by compound_family."""
 
     if (i.meaning_1 != "" and
         (i.family_compound != "" or
             i.pali_clean in CF_SET)):
 
         if i.family_compound != "":
-            fc = DB_SESSION.query(
-                FamilyCompound
-            ).filter(
-                FamilyCompound.compound_family.in_(i.family_compound_list),
-                    # FamilyCompound.compound_family == i.pali_clean
-            ).all()
-
-            # sort by order of the  family compound list
-            word_order = i.family_compound_list
-            fc = sorted(fc, key=lambda x: word_order.index(x.compound_family))
+            # in order of the family compound list
+            fc = [
+                fc_dict[family]
+                for family in dict.fromkeys(i.family_compound_list)
+                if family in fc_dict]
 
         else:
-            fc = DB_SESSION.query(
-                FamilyCompound
-            ).filter(
-                FamilyCompound.compound_family == i.pali_clean
-            ).all()
+            fc = [
+                fc_dict[i.pali_clean]] if i.pali_clean in fc_dict else []
 
         return str(
             family_compound_templ.render(
@@ -332,23 +330,21 @@ def render_family_compound_templ(i: PaliWord, DB_SESSION) -> str:
         return ""
 
 
-def render_family_sets_templ(i: PaliWord, DB_SESSION) -> str:
-    """render html table of all words belonging to the same set"""
+def render_family_sets_templ(
+        i: PaliWord, fs_dict: Dict[str, FamilySet]) -> str:
+    """render html table of all words belonging to the same set.
+    fs_dict is every FamilySet keyed by set."""
 
     if (i.meaning_1 != "" and
             i.family_set != ""):
 
         if len(i.family_set_list) > 0:
 
-            fs = DB_SESSION.query(
-                FamilySet
-            ).filter(
-                FamilySet.set.in_(i.family_set_list)
-            ).all()
-
-            # sort by order of the  family set list
-            word_order = i.family_set_list
-            fs = sorted(fs, key=lambda x: word_order.index(x.set))
+            # in order of the family set list
+            fs = [
+                fs_dict[family]
+                for family in dict.fromkeys(i.family_set_list)
+                if family in fs_dict]
 
             return str(
                 family_set_templ.render(
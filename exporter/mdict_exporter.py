@@ -2,39 +2,40 @@
 # coding: utf-8
 
 import sys
-from functools import reduce
 from rich import print
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 from tools.tic_toc import bip, bop
 sys.path.insert(1, 'tools/writemdict')
 from writemdict import MDictWriter
 
 
-def mdict_synonyms(all_items, item):
-    all_items.append((item['word'], item['definition_html']))
-    for word in item['synonyms']:
-        if word != item['word']:
-            all_items.append((word, f"""@@@LINK={item["word"]}"""))
-    return all_items
+def mdict_items(
+        data_lists: List[List[Dict]]) -> Iterator[Tuple[str, str]]:
+    """yield (word, html) for every entry, with 'mdict' and an h3 tag,
+    then a (synonym, link) for each of its distinct synonyms.
+    each data list is emptied as it goes, so the writer's sorted copy
+    is the only one of the html while the mdx is built"""
 
+    for data_list in data_lists:
+        for index in range(len(data_list)):
+            item = data_list[index]
+            data_list[index] = None
+            html = item['definition_html'].replace("GoldenDict", "MDict")
+            yield item['word'], f"<h3>{item['word']}</h3>{html}"
 
-def export_to_mdict(data_list: List[Dict], PTH: Path) -> None:
-    print("[green]converting to mdict")
+            for word in dict.fromkeys(item['synonyms']):
+                if word != item['word']:
+                    yield word, f"""@@@LINK={item["word"]}"""
 
-    bip()
-    print("[white]adding 'mdict' and h3 tag", end=" ")
-    for i in data_list:
-        i['definition_html'] = i['definition_html'].replace(
-            "GoldenDict", "MDict")
-        i['definition_html'] = f"<h3>{i['word']}</h3>{i['definition_html']}"
-    print(bop())
+        data_list.clear()
 
-    bip()
-    print("[white]reducing synonyms", end=" ")
-    dpd_data = reduce(mdict_synonyms, data_list, [])
-    del data_list
-    print(bop())
+
+def export_to_mdict(
+        data_lists: List[List[Dict]],
+        PTH: Path,
+        resources: Optional[Dict[str, bytes]] = None) -> None:
+    print("[green]converting to mdict")
 
     print("[white]writing mdict", end=" ")
 
@@ -45,7 +46,7 @@ the Digital Pāḷi Dictionary website</a></p>"""
 
     bip()
     writer = MDictWriter(
-        dpd_data,
+        mdict_items(data_lists),
         title="Digital Pāḷi Dictionary",
         description=description)
     print(bop())
@@ -55,3 +56,25 @@ the Digital Pāḷi Dictionary website</a></p>"""
     writer.write(outfile)
     outfile.close()
     print(bop())
+
+    if resources:
+        write_mdd(resources, PTH, description)
+
+
+def write_mdd(
+        resources: Dict[str, bytes], PTH: Path, description: str) -> None:
+    """write the shared resource files linked from entries into an mdd"""
+
+    bip()
+    print("[white]writing mdd", end=" ")
+    mdd_data = {
+        f"\\{file_name}": data for file_name, data in resources.items()}
+    writer = MDictWriter(
+        mdd_data,
+        title="Digital Pāḷi Dictionary",
+        description=description,
+        is_mdd=True)
+    outfile = open(PTH.mdict_mdd_path, 'wb')
+    writer.write(outfile)
+    outfile.close()
+    print(bop())
@@ -6,11 +6,9 @@ from rich import print
 
 from db.get_db_session import get_db_session
 from db.models import PaliWord, FamilyCompound
+from family_html import group_by_family, make_family_table
+from family_html import replace_family_table
 from tools.tic_toc import tic, toc
-from tools.superscripter import superscripter_uni
-from tools.meaning_construction import make_meaning
-from tools.pali_sort_key import pali_sort_key
-from tools.meaning_construction import degree_of_completion
 
 
 def main():
@@ -21,12 +19,12 @@ def main():
     db_session = get_db_session("dpd.db")
 
     dpd_db = db_session.query(
-        PaliWord).filter(PaliWord.family_compound != "").all()
-    dpd_db = sorted(dpd_db, key=lambda x: pali_sort_key(x.pali_1))
+        PaliWord).filter(PaliWord.family_compound != "").order_by(
+            PaliWord.pali_1.collate("pali")).all()
 
     cf_dict = create_comp_fam_dict(dpd_db)
-    cf_dict = compile_cf_html(dpd_db, cf_dict)
-    add_cf_to_db(db_session, cf_dict)
+    cf_html = compile_cf_html(cf_dict)
+    add_cf_to_db(db_session, cf_dict, cf_html)
     toc()
 
 
@@ -34,82 +32,55 @@ def create_comp_fam_dict(dpd_db):
     print("[green]extracting compound families and headwords", end=" ")
 
     # create a dict of all compound families
-    # family: {headwords: [], html: "", }
+    # family: [headwords]
 
-    cf_dict: dict = {}
-
-    for counter, i in enumerate(dpd_db):
-
-        for cf in i.family_compound_list:
-            if cf == " ":
-                print("[bright_red]ERROR: spaces found please remove!")
-            elif cf == "":
-                print("[bright_red]ERROR: '' found please remove!")
-            elif cf == "+":
-                print("[bright_red]ERROR: + found please remove!")
-
-            test1 = re.findall(r"\bcomp\b", i.grammar) != []
-            test2 = "sandhi" in i.pos
-            test3 = "idiom" in i.pos
-            test4 = len(re.sub(r" \d.*$", "", i.pali_1)) < 30
-            test5 = i.meaning_1 != ""
-
-            if (test1 or test2 or test3) and test4 and test5:
-
-                if cf in cf_dict:
-                    cf_dict[cf]["headwords"] += [i.pali_1]
-                else:
-                    cf_dict[cf] = {
-                        "headwords": [i.pali_1],
-                        "html": ""}
+    cf_dict = group_by_family(dpd_db, compound_families)
 
     print(len(cf_dict))
     return cf_dict
 
 
-def compile_cf_html(dpd_db, cf_dict):
-    print("[green]compiling html")
+def compound_families(i: PaliWord) -> list:
+    """the compound families a headword gets listed in"""
 
-    for counter, i in enumerate(dpd_db):
+    for cf in i.family_compound_list:
+        if cf == " ":
+            print("[bright_red]ERROR: spaces found please remove!")
+        elif cf == "":
+            print("[bright_red]ERROR: '' found please remove!")
+        elif cf == "+":
+            print("[bright_red]ERROR: + found please remove!")
 
-        for cf in i.family_compound_list:
-            if cf in cf_dict:
-                if i.pali_1 in cf_dict[cf]["headwords"]:
-                    if cf_dict[cf]["html"] == "":
-                        html_string = "<table class='family'>"
-                    else:
-                        html_string = cf_dict[cf]["html"]
+    test1 = re.findall(r"\bcomp\b", i.grammar) != []
+    test2 = "sandhi" in i.pos
+    test3 = "idiom" in i.pos
+    test4 = len(re.sub(r" \d.*$", "", i.pali_1)) < 30
+    test5 = i.meaning_1 != ""
 
-                    meaning = make_meaning(i)
-                    html_string += "<tr>"
-                    html_string += f"<th>{superscripter_uni(i.pali_1)}</th>"
-                    html_string += f"<td><b>{i.pos}</b></td>"
-                    html_string += f"<td>{meaning} {degree_of_completion(i)}</td>"
-                    html_string += "</tr>"
+    if (test1 or test2 or test3) and test4 and test5:
+        return i.family_compound_list
+    else:
+        return []
 
-                    cf_dict[cf]["html"] = html_string
 
-    for i in cf_dict:
-        cf_dict[i]["html"] += "</table>"
+def compile_cf_html(cf_dict):
+    print("[green]compiling html")
 
-    return cf_dict
+    return {
+        cf: make_family_table(headwords)
+        for cf, headwords in cf_dict.items()}
 
 
-def add_cf_to_db(db_session, cf_dict):
+def add_cf_to_db(db_session, cf_dict, cf_html):
     print("[green]adding to db", end=" ")
 
-    add_to_db = []
-
-    for counter, cf in enumerate(cf_dict):
-        cf_data = FamilyCompound(
-            compound_family=cf,
-            html=cf_dict[cf]["html"],
-            count=len(cf_dict[cf]["headwords"]))
-        add_to_db.append(cf_data)
+    add_to_db = [{
+        "compound_family": cf,
+        "html": cf_html[cf],
+        "count": len(headwords)}
+        for cf, headwords in cf_dict.items()]
 
-    db_session.execute(FamilyCompound.__table__.delete())
-    db_session.add_all(add_to_db)
-    db_session.commit()
+    replace_family_table(db_session, FamilyCompound, add_to_db)
     db_session.close()
     print("[white]ok")
 
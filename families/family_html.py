@@ -0,0 +1,60 @@
+"""Shared parts of the compound, root, word and set family builders:
+group the headwords of each family in one pass, render each family table
+with a single join, and replace the family table with one bulk insert."""
+
+from typing import Callable, Dict, Iterable, List
+
+from sqlalchemy import insert
+
+from db.models import PaliWord
+from tools.superscripter import superscripter_uni
+from tools.meaning_construction import make_meaning
+from tools.meaning_construction import degree_of_completion
+
+
+def group_by_family(
+        dpd_db: Iterable[PaliWord],
+        get_families: Callable[[PaliWord], List[str]]
+) -> Dict[str, List[PaliWord]]:
+    """family: [headwords], in the order of dpd_db.
+    get_families returns the families a headword belongs to."""
+
+    families: Dict[str, List[PaliWord]] = {}
+    for i in dpd_db:
+        for family in get_families(i):
+            if family in families:
+                families[family].append(i)
+            else:
+                families[family] = [i]
+    return families
+
+
+def make_family_row(i: PaliWord) -> str:
+    """one headword's row in a family table"""
+
+    meaning = make_meaning(i)
+    return "".join([
+        "<tr>",
+        f"<th>{superscripter_uni(i.pali_1)}</th>",
+        f"<td><b>{i.pos}</b></td>",
+        f"<td>{meaning} {degree_of_completion(i)}</td>",
+        "</tr>"])
+
+
+def make_family_table(headwords: List[PaliWord]) -> str:
+    """html table of all the headwords in a family"""
+
+    return "".join([
+        "<table class='family'>",
+        *(make_family_row(i) for i in headwords),
+        "</table>"])
+
+
+def replace_family_table(db_session, model, rows: List[dict]) -> None:
+    """delete all the rows of a family table,
+    then add the new rows with a single bulk insert"""
+
+    db_session.execute(model.__table__.delete())
+    if rows:
+        db_session.execute(insert(model), rows)
+    db_session.commit()
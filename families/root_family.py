@@ -12,11 +12,10 @@ from root_matrix import generate_root_matrix
 from root_info import generate_root_info_html
 from db.get_db_session import get_db_session
 from db.models import PaliRoot, PaliWord, FamilyRoot
+from family_html import group_by_family, make_family_table
+from family_html import replace_family_table
 from tools.tic_toc import tic, toc
-from tools.superscripter import superscripter_uni
-from tools.meaning_construction import make_meaning
 from tools.pali_sort_key import pali_sort_key
-from tools.meaning_construction import degree_of_completion
 
 
 def main():
@@ -36,8 +35,8 @@ def main():
         roots_db, key=lambda x: pali_sort_key(x.root))
 
     rf_dict, bases_dict = make_roots_family_dict_and_bases_dict(dpd_db)
-    rf_dict = compile_rf_html(dpd_db, rf_dict)
-    add_rf_to_db(db_session, rf_dict)
+    rf_html = compile_rf_html(rf_dict)
+    add_rf_to_db(db_session, rf_dict, rf_html)
     generate_root_info_html(db_session, roots_db, bases_dict)
     generate_root_matrix(db_session)
     db_session.close()
@@ -46,24 +45,15 @@ def main():
 
 def make_roots_family_dict_and_bases_dict(dpd_db):
     print("[green]extracting root families and bases", end=" ")
-    rf_dict = {}
-    bases_dict = {}
-    for i in dpd_db:
-
-        # compile root subfamilies
-        family = f"{i.root_key},{i.family_root}"
 
-        if family not in rf_dict:
-            rf_dict[family] = {
-                "headwords": [i.pali_1],
-                "html": "",
-                "count": 1,
-                "meaning": i.rt.root_meaning}
-        else:
-            rf_dict[family]["headwords"] += [i.pali_1]
-            rf_dict[family]["count"] += 1
+    # compile root subfamilies
+    # "root_key,family_root": [headwords]
+    rf_dict = group_by_family(
+        dpd_db, lambda i: [f"{i.root_key},{i.family_root}"])
 
-        # compile bases
+    # compile bases
+    bases_dict = {}
+    for i in dpd_db:
         base = re.sub("^.+> ", "", i.root_base)
 
         if base != "":
@@ -76,64 +66,43 @@ def make_roots_family_dict_and_bases_dict(dpd_db):
     return rf_dict, bases_dict
 
 
-def compile_rf_html(dpd_db, rf_dict):
+def compile_rf_html(rf_dict):
     print("[green]compiling html")
 
-    for counter, i in enumerate(dpd_db):
-        family = f"{i.root_key},{i.family_root}"
+    return {
+        rf: make_root_header(rf, headwords) + make_family_table(headwords)
+        for rf, headwords in rf_dict.items()}
 
-        if i.pali_1 in rf_dict[family]["headwords"]:
-            if rf_dict[family]["html"] == "":
-                html_string = "<table class='family'>"
-            else:
-                html_string = rf_dict[family]["html"]
 
-            meaning = make_meaning(i)
-            html_string += "<tr>"
-            html_string += f"<th>{superscripter_uni(i.pali_1)}</th>"
-            html_string += f"<td><b>{i.pos}</b></td>"
-            html_string += f"<td>{meaning} {degree_of_completion(i)}</td>"
-            html_string += "</tr>"
-
-            rf_dict[family]["html"] = html_string
-
-    for rf in rf_dict:
-        header = make_root_header(rf_dict, rf)
-        rf_dict[rf]["html"] = header + rf_dict[rf]["html"] + "</table>"
-    return rf_dict
-
-
-def make_root_header(rf_dict, rf):
+def make_root_header(rf, headwords):
     family_root = rf.split(",")[1]
+    count = len(headwords)
+    meaning = headwords[0].rt.root_meaning
     header = "<p class='heading underlined'>"
-    if rf_dict[rf]["count"] == 1:
+    if count == 1:
         header += "<b>1</b> word belongs to the root family "
     else:
-        header += f"<b>{rf_dict[rf]['count']}</b> words belong to the root family "
-    header += f"<b>{family_root}</b> ({rf_dict[rf]['meaning']})</p>"
+        header += f"<b>{count}</b> words belong to the root family "
+    header += f"<b>{family_root}</b> ({meaning})</p>"
     return header
 
 
-def add_rf_to_db(db_session, rf_dict):
+def add_rf_to_db(db_session, rf_dict, rf_html):
     print("[green]adding to db", end=" ")
 
     add_to_db = []
 
-    for counter, rf in enumerate(rf_dict):
+    for rf, headwords in rf_dict.items():
         root_key = rf.split(",")[0]
         family_root = rf.split(",")[1]
 
-        root_family = FamilyRoot(
-            root_id=root_key,
-            root_family=family_root,
-            html=rf_dict[rf]["html"],
-            count=len(rf_dict[rf]["headwords"]))
-
-        add_to_db.append(root_family)
+        add_to_db.append({
+            "root_id": root_key,
+            "root_family": family_root,
+            "html": rf_html[rf],
+            "count": len(headwords)})
 
-    db_session.execute(FamilyRoot.__table__.delete())
-    db_session.add_all(add_to_db)
-    db_session.commit()
+    replace_family_table(db_session, FamilyRoot, add_to_db)
 
 
 if __name__ == "__main__":
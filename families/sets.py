@@ -4,11 +4,9 @@ from rich import print
 
 from db.get_db_session import get_db_session
 from db.models import PaliWord, FamilySet
+from family_html import group_by_family, make_family_table
+from family_html import replace_family_table
 from tools.tic_toc import tic, toc
-from tools.superscripter import superscripter_uni
-from tools.meaning_construction import make_meaning
-from tools.pali_sort_key import pali_sort_key
-from tools.meaning_construction import degree_of_completion as doc
 
 
 def main():
@@ -17,12 +15,12 @@ def main():
     db_session = get_db_session("dpd.db")
 
     sets_db = db_session.query(
-        PaliWord).filter(PaliWord.family_set != "").all()
-    sets_db = sorted(sets_db, key=lambda x: pali_sort_key(x.pali_1))
+        PaliWord).filter(PaliWord.family_set != "").order_by(
+            PaliWord.pali_1.collate("pali")).all()
 
     sets_dict = make_sets_dict(sets_db)
-    sets_dict = compile_sf_html(sets_db, sets_dict)
-    errors_list = add_sf_to_db(db_session, sets_dict)
+    sets_html = compile_sf_html(sets_dict)
+    errors_list = add_sf_to_db(db_session, sets_dict, sets_html)
     print_errors_list(errors_list)
     toc()
 
@@ -31,82 +29,57 @@ def make_sets_dict(sets_db):
     print("[green]extracting set names", end=" ")
 
     # create a dict of all sets
-    # set: {headwords: [], html: "", }
+    # set: [headwords]
 
-    sets_dict: dict = {}
-
-    for counter, i in enumerate(sets_db):
-
-        for fs in i.family_set_list:
-            if fs == " ":
-                print("[bright_red]ERROR: spaces found please remove!")
-            elif fs == "":
-                print("[bright_red]ERROR: '' found please remove!")
-            elif fs == "+":
-                print("[bright_red]ERROR: + found please remove!")
-
-            if i.meaning_1:
-                if fs in sets_dict:
-                    sets_dict[fs]["headwords"] += [i.pali_1]
-                else:
-                    sets_dict[fs] = {
-                        "headwords": [i.pali_1],
-                        "html": ""}
+    sets_dict = group_by_family(sets_db, set_families)
 
     print(len(sets_dict))
     return sets_dict
 
 
-def compile_sf_html(sets_db, sets_dict):
-    print("[green]compiling html")
-
-    for counter, i in enumerate(sets_db):
+def set_families(i: PaliWord) -> list:
+    """the sets a headword gets listed in"""
 
-        for sf in i.family_set_list:
-            if sf in sets_dict:
-                if i.pali_1 in sets_dict[sf]["headwords"]:
-                    if sets_dict[sf]["html"] == "":
-                        html_string = "<table class='family'>"
-                    else:
-                        html_string = sets_dict[sf]["html"]
+    for fs in i.family_set_list:
+        if fs == " ":
+            print("[bright_red]ERROR: spaces found please remove!")
+        elif fs == "":
+            print("[bright_red]ERROR: '' found please remove!")
+        elif fs == "+":
+            print("[bright_red]ERROR: + found please remove!")
 
-                    meaning = make_meaning(i)
-                    html_string += "<tr>"
-                    html_string += f"<th>{superscripter_uni(i.pali_1)}</th>"
-                    html_string += f"<td><b>{i.pos}</b></td>"
-                    html_string += f"<td>{meaning} {doc(i)}</td>"
-                    html_string += "</tr>"
+    if i.meaning_1:
+        return i.family_set_list
+    else:
+        return []
 
-                    sets_dict[sf]["html"] = html_string
 
-    for i in sets_dict:
-        sets_dict[i]["html"] += "</table>"
+def compile_sf_html(sets_dict):
+    print("[green]compiling html")
 
-    return sets_dict
+    return {
+        sf: make_family_table(headwords)
+        for sf, headwords in sets_dict.items()}
 
 
-def add_sf_to_db(db_session, sets_dict):
+def add_sf_to_db(db_session, sets_dict, sets_html):
     print("[green]adding to db", end=" ")
 
     add_to_db = []
     errors_list = []
 
-    for counter, sf in enumerate(sets_dict):
-        count = len(sets_dict[sf]["headwords"])
-
-        sf_data = FamilySet(
-            set=sf,
-            html=sets_dict[sf]["html"],
-            count=count)
+    for sf, headwords in sets_dict.items():
+        count = len(headwords)
 
-        add_to_db.append(sf_data)
+        add_to_db.append({
+            "set": sf,
+            "html": sets_html[sf],
+            "count": count})
 
         if count < 3:
             errors_list += [sf]
 
-    db_session.execute(FamilySet.__table__.delete())
-    db_session.add_all(add_to_db)
-    db_session.commit()
+    replace_family_table(db_session, FamilySet, add_to_db)
     db_session.close()
     print("[white]ok")
 
@@ -4,11 +4,9 @@
 
 from rich import print
 
+from family_html import group_by_family, make_family_table
+from family_html import replace_family_table
 from tools.tic_toc import tic, toc
-from tools.superscripter import superscripter_uni
-from tools.meaning_construction import make_meaning
-from tools.pali_sort_key import pali_sort_key
-from tools.meaning_construction import degree_of_completion
 from db.get_db_session import get_db_session
 from db.models import PaliWord, FamilyWord
 
@@ -21,12 +19,12 @@ def main():
     db_session = get_db_session("dpd.db")
 
     wf_db = db_session.query(
-        PaliWord).filter(PaliWord.family_word != "").all()
-    wf_db = sorted(wf_db, key=lambda x: pali_sort_key(x.pali_1))
+        PaliWord).filter(PaliWord.family_word != "").order_by(
+            PaliWord.pali_1.collate("pali")).all()
 
     wf_dict = make_word_fam_dict(wf_db)
-    wf_dict = compile_wf_html(wf_db, wf_dict)
-    errors_list = add_wf_to_db(db_session, wf_dict)
+    wf_html = compile_wf_html(wf_dict)
+    errors_list = add_wf_to_db(db_session, wf_dict, wf_html)
     print_errors_list(errors_list)
     toc()
 
@@ -35,72 +33,42 @@ def make_word_fam_dict(wf_db):
     print("[green]extracting word families", end=" ")
 
     # create a dict of all word families
-    # word: {headwords: [], html: "", }
+    # word: [headwords]
 
-    wf_dict: dict = {}
-
-    for counter, i in enumerate(wf_db):
-        wf = i.family_word
-
-        if " " in wf:
+    for i in wf_db:
+        if " " in i.family_word:
             print("[bright_red]ERROR: spaces found please remove!")
 
-        if wf in wf_dict:
-            wf_dict[wf]["headwords"] += [i.pali_1]
-        else:
-            wf_dict[wf] = {
-                "headwords": [i.pali_1],
-                "html": ""}
+    wf_dict = group_by_family(wf_db, lambda i: [i.family_word])
 
     print(len(wf_dict))
     return wf_dict
 
 
-def compile_wf_html(wf_db, wf_dict):
+def compile_wf_html(wf_dict):
     print("[green]compiling html")
 
-    for counter, i in enumerate(wf_db):
-        wf = i.family_word
-        if i.pali_1 in wf_dict[wf]["headwords"]:
-            if wf_dict[wf]["html"] == "":
-                html_string = "<table class='family'>"
-            else:
-                html_string = wf_dict[wf]["html"]
-
-            meaning = make_meaning(i)
-            html_string += "<tr>"
-            html_string += f"<th>{superscripter_uni(i.pali_1)}</th>"
-            html_string += f"<td><b>{i.pos}</b></td>"
-            html_string += f"<td>{meaning} {degree_of_completion(i)}</td>"
-            html_string += "</tr>"
-
-            wf_dict[wf]["html"] = html_string
-
-    for i in wf_dict:
-        wf_dict[i]["html"] += "</table>"
-
-    return wf_dict
+    return {
+        wf: make_family_table(headwords)
+        for wf, headwords in wf_dict.items()}
 
 
-def add_wf_to_db(db_session, wf_dict):
+def add_wf_to_db(db_session, wf_dict, wf_html):
     print("[green]adding to db", end=" ")
 
     add_to_db = []
     errors_list = []
 
-    for counter, wf in enumerate(wf_dict):
-        if len(wf_dict[wf]["headwords"]) < 2:
+    for wf, headwords in wf_dict.items():
+        if len(headwords) < 2:
             errors_list += [wf]
 
-        wf_data = FamilyWord(
-            word_family=wf,
-            html=wf_dict[wf]["html"],
-            count=len(wf_dict[wf]["headwords"]))
-        add_to_db.append(wf_data)
+        add_to_db.append({
+            "word_family": wf,
+            "html": wf_html[wf],
+            "count": len(headwords)})
 
-    db_session.execute(FamilyWord.__table__.delete())
-    db_session.add_all(add_to_db)
-    db_session.commit()
+    replace_family_table(db_session, FamilyWord, add_to_db)
     db_session.close()
     print("[white]ok")
 
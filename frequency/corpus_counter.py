@@ -1,17 +1,25 @@
 #!/usr/bin/env python3
 
-"""Creates a word frequency file for every book in VRI Chaṭṭha Saṅgāyana Tipiṭaka."""
+"""Creates a word frequency file for every book in VRI Chaṭṭha Saṅgāyana Tipiṭaka,
+and one corpus frequency store of them all."""
 
+import multiprocessing
 import nltk
 import pandas as pd
 import os
 
+from collections import Counter
+
 from rich import print
 from tools.clean_machine import clean_machine
+from tools.corpus_frequency import count_sc_ebts, save_corpus_frequency
 from tools.pali_text_files import ebts
 from tools.paths import ProjectPaths as PTH
 nltk.download('punkt')
 
+multiprocess_on = True
+processes = multiprocessing.cpu_count()
+
 
 def main():
     """Do the job."""
@@ -306,78 +314,89 @@ def sanity_tests(tipitaka_dict, list_of_sections):
     make_raw_text_csv(tipitaka_dict)
 
 
+def clean_and_count(text_file):
+    """Clean one text file and count its words."""
+    with open(PTH.cst_txt_dir.joinpath(text_file)) as f:
+        text_clean = clean_machine(f.read())
+    return text_clean, Counter(nltk.word_tokenize(text_clean))
+
+
 def make_raw_text_csv(tipitaka_dict):
     """Make clean text files, just letters no punctation."""
     print("[green]making raw text csvs")
 
-    full_text = ""
-    ebt_text = ""
+    # every file is cleaned and counted once, in order,
+    # then the counts are added up by section, ebts and tipiṭaka
+    text_files = [t for texts in tipitaka_dict.values() for t in texts]
 
-    for section, texts in tipitaka_dict.items():
-        print(f"{section}")
+    if multiprocess_on is True:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(processes=processes) as pool:
+            make_section_files(
+                tipitaka_dict, pool.imap(clean_and_count, text_files))
+    else:
+        make_section_files(
+            tipitaka_dict, map(clean_and_count, text_files))
 
-        text_clean = ""
 
-        for t in texts:
-            f = open(PTH.cst_txt_dir.joinpath(t))
-            file_read = f.read()
-            text_clean += f"{clean_machine(file_read)}\n\n"
+def make_section_files(tipitaka_dict, cleaned_and_counted):
+    """Save the raw text and word count of every section,
+    the ebts and the whole tipiṭaka."""
 
-            if t in ebts:
-                ebt_text += f"{clean_machine(file_read)}\n\n"
+    tipitaka_count = Counter()
+    ebt_count = Counter()
+    column_counts = {}
 
-        full_text += text_clean
+    with open(PTH.tipitaka_raw_text_path, "w") as tipitaka_file, \
+            open(PTH.ebt_raw_text_path, "w") as ebt_file:
 
-        with open(
-                PTH.raw_text_dir.joinpath(section).with_suffix(".txt"),
-                "w") as f:
-            f.write(text_clean)
+        for section, texts in tipitaka_dict.items():
+            print(f"{section}")
 
-        # !!! make one function for all these raw and csv saves
-        # !!! text, df, raw_text_path word_count_path
+            section_count = Counter()
 
-        word_count_df = make_word_count_df(text_clean)
-        word_count_df.to_csv(
-            PTH.word_count_dir.joinpath(section).with_suffix(".csv"),
-            sep="\t", index=None, header=None)
+            with open(
+                    PTH.raw_text_dir.joinpath(section).with_suffix(".txt"),
+                    "w") as section_file:
 
-    save_ebt_raw_text_and_csv(ebt_text)
-    save_tipitaka_raw_text_and_csv(full_text)
+                for t in texts:
+                    text_clean, word_count = next(cleaned_and_counted)
+                    section_file.write(f"{text_clean}\n\n")
+                    tipitaka_file.write(f"{text_clean}\n\n")
+                    section_count.update(word_count)
 
+                    if t in ebts:
+                        ebt_file.write(f"{text_clean}\n\n")
+                        ebt_count.update(word_count)
 
-def make_word_count_df(text):
-    """Tokenize the words and count frequency."""
-    words = nltk.word_tokenize(text)
-    freq = nltk.FreqDist(words).most_common()
-    word_count_df = pd.DataFrame(freq)
-    return word_count_df
+            tipitaka_count.update(section_count)
+            column_counts[section] = save_word_count(
+                section_count,
+                PTH.word_count_dir.joinpath(section).with_suffix(".csv"))
 
+    print("[green]saving ebts csv")
+    column_counts["ebts"] = save_word_count(
+        ebt_count, PTH.ebt_word_count_path)
 
-def save_tipitaka_raw_text_and_csv(full_text):
-    """Save full tipitaka frequency, all files in one."""
     print("[green]saving tipiṭaka csv")
+    column_counts["tipitaka"] = save_word_count(
+        tipitaka_count, PTH.tipitaka_word_count_path)
 
-    with open(PTH.tipitaka_raw_text_path, "w") as f:
-        f.write(full_text)
-
-    full_text_df = make_word_count_df(full_text)
-    full_text_df.to_csv(
-        PTH.tipitaka_word_count_path,
-        sep="\t", index=None, header=None)
+    print("[green]saving sutta central ebts csv")
+    column_counts["sc_ebts"] = save_word_count(
+        count_sc_ebts(), PTH.sc_ebt_word_count_path)
 
+    print("[green]saving corpus frequency")
+    save_corpus_frequency(PTH, column_counts)
 
-def save_ebt_raw_text_and_csv(ebt_text):
-    """Save Early Buddhist Texts frequency."""
-    print("[green]saving ebts csv")
-
-    with open(
-            PTH.ebt_raw_text_path, "w") as f:
-        f.write(ebt_text)
 
-    ebt_text_df = make_word_count_df(ebt_text)
-    ebt_text_df.to_csv(
-        PTH.ebt_word_count_path,
-        sep="\t", index=None, header=None)
+def save_word_count(word_count, word_count_path):
+    """Save words and counts, most common first."""
+    most_common = word_count.most_common()
+    word_count_df = pd.DataFrame(most_common)
+    word_count_df.to_csv(
+        word_count_path, sep="\t", index=None, header=None)
+    return most_common
 
 
 if __name__ == "__main__":
@@ -1,19 +1,19 @@
 #!/usr/bin/env python3.11
 
-import csv
 import pickle
 import sys
 
 from functools import reduce
-from json import loads
 from mako.template import Template
 from os import popen
 from rich import print
 from typing import List
 
 from db.get_db_session import get_db_session
-from db.models import PaliWord, Sandhi, InflectionTemplates
+from db.models import PaliWord, Sandhi
 
+from tools.inflection_templates import load_inflection_templates
+from tools.corpus_frequency import load_corpus_frequency
 from tools.niggahitas import add_niggahitas
 from tools.pali_sort_key import pali_sort_key
 from tools.paths import ProjectPaths as PTH
@@ -67,10 +67,8 @@ def main():
             i.pos = "interr"
 
     # tipitaka word set
-    with open(PTH.tipitaka_word_count_path) as f:
-        reader = csv.reader(f, delimiter="\t")
-        tipitaka_word_set = set([row[0] for row in reader])
-        print(f"[green]all tipitaka words{len(tipitaka_word_set):>22,}")
+    tipitaka_word_set = load_corpus_frequency(PTH).words_in("tipitaka")
+    print(f"[green]all tipitaka words{len(tipitaka_word_set):>22,}")
 
     sandhi_db = db_session.query(Sandhi).all() 
     words_in_sandhi_set = make_words_in_sandhi_set(sandhi_db)
@@ -83,6 +81,9 @@ def main():
 
     print("[green]generating grammar dictionary")
 
+    # parse every inflection template once
+    templates_dict = load_inflection_templates(db_session)
+
     # grammar_dict structure {inflection: [(headword, pos, grammar)]}
     grammar_dict = {}
     
@@ -140,61 +141,34 @@ def main():
 
         # generate all inflections
         else:
-            # get template
-            template = db_session.query(
-                InflectionTemplates
-            ).filter(
-                InflectionTemplates.pattern == i.pattern
-            ).first()
-
-            template_data = loads(template.data)
-
-            # data is a nest of lists
-            # list[] table
-            # list[[]] row
-            # list[[[]]] cell
-            # row 0 is the top header
-            # column 0 is the grammar header
-            # odd rows > 0 are inflections
-            # even rows > 0 are grammar info
-
-            for row_number, row_data in enumerate(template_data):
-
-                for column_number, cell_data in enumerate(row_data):
-
-                    if (row_number > 0 and
-                        column_number % 2 == 1 and
-                            column_number > 0):
-                        grammar: str = [row_data[column_number+1]][0][0]
-
-                        for inflection in cell_data:
-                            if inflection != "":
-                                inflected_word = f"{i.stem}{inflection}"
-                                if inflected_word in all_words_set:
-
-                                    data_line = (i.pali_1, i.pos, grammar)
-                                    html_line = "<tr>"
-                                    html_line += f"<td><b>{i.pos}</b></td>"
-                                    html_line += f"<td>{grammar}</td>"
-                                    html_line += "<td>of</td>"
-                                    html_line += f"<td>{i.pali_clean}</td>"
-                                    html_line += "</tr>"
-
-                                    # grammar_dict update
-                                    if inflected_word not in grammar_dict:
-                                        grammar_dict[inflected_word] = [data_line]
-                                    else:
-                                        if data_line not in grammar_dict[inflected_word]:
-                                            grammar_dict[inflected_word].append(data_line)
-
-                                    # grammar_dict_html update
-                                    if inflected_word not in grammar_dict_html:
-                                        grammar_dict_html[inflected_word] = f"{html_header}{html_line}"
-                                        grammar_dict_table[inflected_word] = f"{html_table_header}{html_line}"
-                                    else:
-                                        if html_line not in grammar_dict_html[inflected_word]:
-                                            grammar_dict_html[inflected_word] += html_line
-                                            grammar_dict_table[inflected_word] += html_line
+            template = templates_dict[i.pattern]
+
+            for inflected_word, grammar in template.expand(i.stem):
+                if inflected_word in all_words_set:
+
+                    data_line = (i.pali_1, i.pos, grammar)
+                    html_line = "<tr>"
+                    html_line += f"<td><b>{i.pos}</b></td>"
+                    html_line += f"<td>{grammar}</td>"
+                    html_line += "<td>of</td>"
+                    html_line += f"<td>{i.pali_clean}</td>"
+                    html_line += "</tr>"
+
+                    # grammar_dict update
+                    if inflected_word not in grammar_dict:
+                        grammar_dict[inflected_word] = [data_line]
+                    else:
+                        if data_line not in grammar_dict[inflected_word]:
+                            grammar_dict[inflected_word].append(data_line)
+
+                    # grammar_dict_html update
+                    if inflected_word not in grammar_dict_html:
+                        grammar_dict_html[inflected_word] = f"{html_header}{html_line}"
+                        grammar_dict_table[inflected_word] = f"{html_table_header}{html_line}"
+                    else:
+                        if html_line not in grammar_dict_html[inflected_word]:
+                            grammar_dict_html[inflected_word] += html_line
+                            grammar_dict_table[inflected_word] += html_line
 
         if counter % 5000 == 0:
             print(f"{counter:>10,} / {len(db):<10,}{i.pali_1[:17]:>17}")
@@ -2,16 +2,20 @@
 # coding: utf-8
 
 import re
-import json
 import pickle
+import multiprocessing
 
 from rich import print
-from typing import List, Dict
+from sqlalchemy import insert
+from typing import Iterable, List, Dict, NamedTuple
 
 from db.get_db_session import get_db_session
 from db.models import PaliWord, InflectionTemplates, DerivedData
 
 from tools.configger import config_test, config_update
+from tools.inflection_templates import InflectionTemplate
+from tools.inflection_templates import load_inflection_templates
+from tools.corpus_frequency import load_corpus_frequency
 from tools.tic_toc import tic, toc
 from tools.pos import CONJUGATIONS
 from tools.pos import DECLENSIONS
@@ -25,10 +29,30 @@ dpd_db = db_session.query(PaliWord).all()
 changed_templates: list = []
 changed_headwords: list = []
 
-# !!! how is all_tipitaka_words getting generated?
+# ids per DELETE ... WHERE id IN (...), under sqlite's bound variable limit
+sqlite_max_variables = 32_000
 
-with open(PTH.all_tipitaka_words_path, "rb") as f:
-    all_tipitaka_words: set = pickle.load(f)
+# generate tables across a process pool
+multiprocess_on = True
+processes = multiprocessing.cpu_count()
+chunk_size = 1000
+
+# pattern: parsed template, loaded once per run
+templates_dict: Dict[str, InflectionTemplate] = {}
+
+
+class Headword(NamedTuple):
+    """the parts of a PaliWord an inflection table needs,
+    small enough to send to a worker process"""
+    id: int
+    pali_1: str
+    pali_clean: str
+    stem: str
+    pattern: str
+    pos: str
+
+
+all_tipitaka_words: set = load_corpus_frequency(PTH).words_in("tipitaka")
 
 
 def main():
@@ -46,7 +70,7 @@ def main():
         test_changes()
 
     print("[green]generating html tables and lists")
-    add_to_db = []
+    headwords: List[Headword] = []
     for i in dpd_db:
 
         test1 = i.pali_1 in changed_headwords
@@ -54,55 +78,36 @@ def main():
         test3 = regenerate_all is True
 
         if test1 or test2 or test3:
+            headwords.append(Headword(
+                i.id, i.pali_1, i.pali_clean, i.stem, i.pattern, i.pos))
 
-            # regenerate is true then delete the whole table
-            # regenerate is false then just delete the row
-            # pattern != "" then add html table and list
-            # stem contains "!" then add table and clean headword
-            # pattern == "" then no table, just add clean headword
-
-            if regenerate_all is True:
-                db_session.execute(DerivedData.__table__.delete())
-
-            else:
-                exists = db_session.query(DerivedData).filter(
-                    DerivedData.id == i.id).first()
+    # regenerate is true then delete the whole table
+    # regenerate is false then just delete the changed rows
 
-                if exists is not None:
-                    db_session.delete(exists)
+    if regenerate_all is True:
+        db_session.execute(DerivedData.__table__.delete())
 
-            if i.pattern != "":
-                html, inflections_list = generate_inflection_table(i)
-
-                derived_data = DerivedData(
-                    id=i.id,
-                    # pali_1=i.pali_1,
-                    inflections=",".join(inflections_list),
-                    html_table=html
-                )
-
-                if "!" in i.stem:
-                    derived_data = DerivedData(
-                        id=i.id,
-                        # pali_1=i.pali_1,
-                        inflections=i.pali_clean,
-                        html_table=html,
-                    )
-
-            elif i.pattern == "":
-                derived_data = DerivedData(
-                    id=i.id,
-                    inflections=i.pali_clean
-                )
-
-            add_to_db.append(derived_data)
-
-    db_session.commit()
+    else:
+        changed_ids = [i.id for i in headwords]
+        for x in range(0, len(changed_ids), sqlite_max_variables):
+            db_session.execute(
+                DerivedData.__table__.delete().where(
+                    DerivedData.id.in_(
+                        changed_ids[x:x + sqlite_max_variables])))
 
     print("[green]adding to db")
 
-    for row in add_to_db:
-        db_session.add(row)
+    # parse each template once, before any workers get forked
+    global templates_dict
+    templates_dict = load_inflection_templates(db_session)
+
+    if multiprocess_on is True and len(headwords) > chunk_size:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(processes=processes) as pool:
+            add_to_db(pool.imap(
+                make_derived_data, headwords, chunksize=chunk_size))
+    else:
+        add_to_db(map(make_derived_data, headwords))
 
     with open(PTH.changed_headwords_path, "wb") as f:
         pickle.dump(changed_headwords, f)
@@ -120,6 +125,45 @@ def main():
     toc()
 
 
+def make_derived_data(i: Headword) -> dict:
+    """make a derived_data row for one headword"""
+
+    # pattern != "" then add html table and list
+    # stem contains "!" then add table and clean headword
+    # pattern == "" then no table, just add clean headword
+
+    if i.pattern != "":
+        html, inflections_list = generate_inflection_table(i)
+
+        if "!" in i.stem:
+            inflections = i.pali_clean
+        else:
+            inflections = ",".join(inflections_list)
+
+    elif i.pattern == "":
+        html = ""
+        inflections = i.pali_clean
+
+    return {
+        "id": i.id,
+        "inflections": inflections,
+        "html_table": html}
+
+
+def add_to_db(rows: Iterable[dict]) -> None:
+    """insert derived_data rows in batches, as they are made"""
+
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == 10_000:
+            db_session.execute(insert(DerivedData), batch)
+            batch = []
+
+    if batch:
+        db_session.execute(insert(DerivedData), batch)
+
+
 def test_inflection_template_changed():
     """test if the inflection template has changes since the last run"""
 
@@ -286,21 +330,22 @@ def test_changes() -> None:
     test_missing_id()
 
 
-def generate_inflection_table(i: PaliWord):
+def generate_inflection_table(i: Headword):
     """generate the inflection table based on stem + pattern and template"""
 
-    table_data = json.loads(i.it.data)
+    template = templates_dict[i.pattern]
+    like = template.like
     inflections_list: list = [i.pali_clean]
 
     # heading
     html: str = "<p class='heading'>"
     html += f"<b>{superscripter_uni(i.pali_1)}</b> is <b>{i.pattern}</b> "
-    if i.it.like != "irreg":
+    if like != "irreg":
         if i.pos in CONJUGATIONS:
             html += "conjugation "
         elif i.pos in DECLENSIONS:
             html += "declension "
-        html += f"(like <b>{i.it.like})</b>"
+        html += f"(like <b>{like})</b>"
     else:
         if i.pos in CONJUGATIONS:
             html += "conjugation "
@@ -312,54 +357,38 @@ def generate_inflection_table(i: PaliWord):
     html += "<table class='inflection'>"
     stem = re.sub(r"\!|\*", "", i.stem)
 
-    # data is a nest of lists
-    # list[] table
-    # list[[]] row
-    # list[[[]]] cell
-    # row 0 is the top header
-    # column 0 is the grammar header
-    # odd rows > 0 are inflections
-    # even rows > 0 are grammar info
-
-    for row in enumerate(table_data):
-        row_number: int = row[0]
-        row_data: List[list] = row[1]
-        html += "<tr>"
-        for column in enumerate(row_data):
-            column_number: int = column[0]
-            cell_data: List = column[1]
-            if row_number == 0:
-                if column_number == 0:
-                    html += "<th></th>"
-                if column_number % 2 == 1:
-                    html += f"<th>{cell_data[0]}</th>"
-            elif row_number > 0:
-                if column_number == 0:
-                    html += f"<th>{cell_data[0]}</th>"
-                elif column_number % 2 == 1 and column_number > 0:
-                    title: str = [row_data[column_number + 1]][0][0]
-
-                    for inflection in cell_data:
-                        if inflection == "":
-                            html += f"<td title='{title}'></td>"
+    html += "<tr><th></th>"
+    for heading in template.headings:
+        html += f"<th>{heading}</th>"
+    html += "</tr>"
+
+    for row in template.rows:
+        html += f"<tr><th>{row.heading}</th>"
+        for cell in row.cells:
+            title = cell.grammar
+            endings = cell.endings
+
+            for inflection in endings:
+                if inflection == "":
+                    html += f"<td title='{title}'></td>"
+                else:
+                    word_clean = f"{stem}{inflection}"
+                    if word_clean in all_tipitaka_words:
+                        word = f"{stem}<b>{inflection}</b>"
+                    else:
+                        word = f"<span class='gray'>{stem}<b>{inflection}</b></span>"
+
+                    if len(endings) == 1:
+                        html += f"<td title='{title}'>{word}</td>"
+                    else:
+                        if inflection == endings[0]:
+                            html += f"<td title='{title}'>{word}<br>"
+                        elif inflection != endings[-1]:
+                            html += f"{word}<br>"
                         else:
-                            word_clean = f"{stem}{inflection}"
-                            if word_clean in all_tipitaka_words:
-                                word = f"{stem}<b>{inflection}</b>"
-                            else:
-                                word = f"<span class='gray'>{stem}<b>{inflection}</b></span>"
-
-                            if len(cell_data) == 1:
-                                html += f"<td title='{title}'>{word}</td>"
-                            else:
-                                if inflection == cell_data[0]:
-                                    html += f"<td title='{title}'>{word}<br>"
-                                elif inflection != cell_data[-1]:
-                                    html += f"{word}<br>"
-                                else:
-                                    html += f"{word}</td>"
-                            if word_clean not in inflections_list:
-                                inflections_list.append(word_clean)
+                            html += f"{word}</td>"
+                    if word_clean not in inflections_list:
+                        inflections_list.append(word_clean)
 
         html += "</tr>"
     html += "</table>"
@@ -9,6 +9,7 @@ from db.get_db_session import get_db_session
 from db.models import PaliRoot, PaliWord, DerivedData, Sandhi
 from tools.pali_sort_key import pali_sort_key
 from tools.paths import ProjectPaths as PTH
+from tools.corpus_frequency import load_corpus_frequency
 from tools.sandhi_words import make_words_in_sandhi_set
 from tools.headwords_clean_set import make_clean_headwords_set
 
@@ -27,9 +28,7 @@ def inflection_to_headwords():
 
     bip()
     print(f"[green]{'all tipitaka words set':<30}", end="")
-    with open(PTH.tipitaka_word_count_path) as f:
-        reader = csv.reader(f, delimiter="\t")
-        all_tipitaka_words: set = set([row[0] for row in reader])
+    all_tipitaka_words: set = load_corpus_frequency(PTH).words_in("tipitaka")
     print(f"{len(all_tipitaka_words):>10,}{bop():>10}")
 
     bip()
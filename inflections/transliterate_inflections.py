@@ -10,11 +10,12 @@ into Sinhala, Devanagari and Thai, and write back into db."""
 
 import json
 import pickle
+import multiprocessing
 
 from aksharamukha import transliterate
 from rich import print
 from subprocess import check_output
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from db.get_db_session import get_db_session
 from db.models import PaliWord, DerivedData
@@ -34,7 +35,19 @@ with open(PTH.changed_headwords_path, "rb") as f:
 with open(PTH.template_changed_path, "rb") as f:
     changed_templates: list = pickle.load(f)
 
-translit_dict: Dict = {}
+# headwords per transliteration batch
+batch_size = 5000
+
+# transliterate batches across a process pool
+multiprocess_on = True
+processes = multiprocessing.cpu_count()
+
+# derived_data column: (aksharamukha script, post options)
+scripts: Dict[str, Tuple[str, List[str]]] = {
+    "sinhala": ("Sinhala", ["SinhalaPali"]),
+    "devanagari": ("Devanagari", []),
+    "thai": ("Thai", []),
+}
 
 
 def main():
@@ -51,84 +64,55 @@ def main():
 
     print(f"[green]regenerate all [white]{regenerate_all}")
 
-    # aksharamukha works much faster with large text files than smaller lists
-    # inflections_to_transliterate_string contains the inflections,
-    # and inflections_index_dict contains the line numbers
+    print("[green]finding inflections to transliterate")
+    to_transliterate: List[PaliWord] = []
 
-    print("[green]creating string of inflections to transliterate")
-    inflections_to_transliterate_string: str = ""
-    inflections_index_dict: dict = {}
-    inflections_for_json_dict: dict = {}
-    counter: int = 0
-
-    for counter, i in enumerate(dpd_db):
+    for i in dpd_db:
         test1 = i.pattern in changed_templates
         test2 = i.pali_1 in changed_headwords
         test3 = regenerate_all
 
         if test1 or test2 or test3:
-            inflections: list = i.dd.inflections_list
-            inflections_index_dict[counter] = i.pali_1
-            inflections_for_json_dict[i.pali_1] = {"inflections": inflections}
-
-            # inflections_to_transliterate_string += (f"{i.pali_1}\t")
-            for inflection in inflections:
-                inflections_to_transliterate_string += f"{inflection},"
-            inflections_to_transliterate_string += "\n"
-
-        else:
-            inflections_index_dict[counter] = i.pali_1
-            inflections_to_transliterate_string += "\n"
+            to_transliterate.append(i)
 
     # saving json for path nirvana transliterator
 
+    inflections_for_json_dict: dict = {
+        i.pali_1: {"inflections": i.dd.inflections_list}
+        for i in to_transliterate}
+
     with open(PTH.inflections_to_translit_json_path, "w") as f:
         f.write(json.dumps(
             inflections_for_json_dict, ensure_ascii=False, indent=4))
 
-    # transliterating with aksharamukha
-
-    print("[green]transliterating sinhala with aksharamukha")
-    sinhala: str = transliterate.process(
-        "IASTPali", "Sinhala", inflections_to_transliterate_string,
-        post_options=['SinhalaPali'])
-
-    print("[green]transliterating devanagari with aksharamukha")
-    devanagari: str = transliterate.process(
-        "IASTPali", "Devanagari", inflections_to_transliterate_string)
-
-    print("[green]transliterating thai with aksharamukha")
-    thai: str = transliterate.process(
-        "IASTPali", "Thai", inflections_to_transliterate_string)
-
-    sinhala_lines: list = sinhala.split("\n")
-    devanagari_lines: list = devanagari.split("\n")
-    thai_lines: list = thai.split("\n")
-
-    print("[green]making inflections dictionary")
-
-    for counter, line in enumerate(sinhala_lines[:-1]):
-        if line:
-            headword: str = inflections_index_dict[counter]
-            sinhala_inflections_set: set = set(line.split(","))
-            sinhala_inflections_set.remove('')
-            translit_dict[headword] = {
-                "sinhala": sinhala_inflections_set,
-                "devanagari": set(), "thai": set()}
-
-    for counter, line in enumerate(devanagari_lines[:-1]):
-        if line:
-            headword: str = inflections_index_dict[counter]
-            devanagari_inflections_set: set = set(line.split(","))
-            devanagari_inflections_set.remove('')
-            translit_dict[headword]["devanagari"] = devanagari_inflections_set
-
-    for counter, line in enumerate(thai_lines[:-1]):
-        if line:
-            headword: str = inflections_index_dict[counter]
-            thai_inflections_set: set = set(line.split(","))
-            thai_inflections_set.remove('')
-            translit_dict[headword]["thai"] = thai_inflections_set
+    del inflections_for_json_dict
+
+    # aksharamukha works much faster with large text than smaller lists,
+    # so the inflections go in batches of lines, one line per headword.
+    # each script of each batch gets transliterated in a worker process,
+    # and written straight back into derived_data.
+
+    batches: List[List[PaliWord]] = [
+        to_transliterate[x:x + batch_size]
+        for x in range(0, len(to_transliterate), batch_size)]
+
+    print("[green]transliterating with aksharamukha", end=" ")
+    print(f"[white]{len(to_transliterate):,} words in {len(batches):,} batches")
+
+    tasks = (
+        (script, batch_number, make_batch_text(batch))
+        for script in scripts
+        for batch_number, batch in enumerate(batches))
+
+    if multiprocess_on is True:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(processes=processes) as pool:
+            for script, batch_number, lines in \
+                    pool.imap_unordered(transliterate_batch, tasks):
+                save_batch(script, batches[batch_number], lines)
+    else:
+        for script, batch_number, lines in map(transliterate_batch, tasks):
+            save_batch(script, batches[batch_number], lines)
 
     # path nirvana transliteration using node.js
     # pali-script.mjs produces different orthography from akshramusha
@@ -150,31 +134,21 @@ def main():
         new_inflections: dict = json.load(f)
         print(f"{len(new_inflections)}")
 
-    for headword, values in new_inflections.items():
-        if values["sinhala"]:
-
-            translit_dict[headword]["sinhala"].update(
-                set(new_inflections[headword]["sinhala"]))
-
-            translit_dict[headword]["devanagari"].update(
-                set(new_inflections[headword]["devanagari"]))
+    dd_dict: Dict[str, DerivedData] = {
+        i.pali_1: i.dd for i in to_transliterate}
 
-            translit_dict[headword]["thai"].update(
-                set(new_inflections[headword]["thai"]))
+    for headword, values in new_inflections.items():
+        if values["sinhala"] and headword in dd_dict:
+            dd = dd_dict[headword]
+            for script in scripts:
+                inflections_set: set = set(getattr(dd, f"{script}_list"))
+                inflections_set.update(values[script])
+                inflections_set.discard("")
+                setattr(dd, script, ",".join(inflections_set))
 
     # write back into database
     print("[green]writing to db")
 
-    for i in dpd_db:
-        if i.pali_1 in translit_dict:
-
-            i.dd.sinhala = ",".join(
-                list(translit_dict[i.pali_1]["sinhala"]))
-            i.dd.devanagari = ",".join(
-                list(translit_dict[i.pali_1]["devanagari"]))
-            i.dd.thai = ",".join(
-                list(translit_dict[i.pali_1]["thai"]))
-
     db_session.commit()
     db_session.close()
 
@@ -184,5 +158,33 @@ def main():
     toc()
 
 
+def make_batch_text(batch: List[PaliWord]) -> str:
+    """one line of comma separated inflections per headword"""
+
+    return "".join(f"{i.dd.inflections}," + "\n" for i in batch)
+
+
+def transliterate_batch(task: Tuple[str, int, str]) -> Tuple[str, int, list]:
+    """transliterate one batch into one script in a worker process"""
+
+    script, batch_number, text = task
+    target, post_options = scripts[script]
+    print(f"[green]transliterating {script} batch {batch_number}")
+
+    transliterated: str = transliterate.process(
+        "IASTPali", target, text, post_options=post_options)
+
+    return script, batch_number, transliterated.split("\n")[:-1]
+
+
+def save_batch(script: str, batch: List[PaliWord], lines: list) -> None:
+    """write a transliterated batch back into derived_data"""
+
+    for i, line in zip(batch, lines):
+        inflections_set: set = set(line.split(","))
+        inflections_set.discard("")
+        setattr(i.dd, script, ",".join(inflections_set))
+
+
 if __name__ == "__main__":
     main()
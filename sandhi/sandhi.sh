@@ -18,5 +18,7 @@ poetry install
 # poetry shell
 export PYTHONPATH=$PYTHONPATH:sandhi/tools
 nohup poetry run python3.11 sandhi/sandhi_splitter.py &
+# to carry on after a crash or reboot
+# nohup poetry run python3.11 sandhi/sandhi_splitter.py --resume &
 # cat nohup.out
 # zip -j -r do_output.zip sandhi/output/ && zip do_output nohup.out
\ No newline at end of file
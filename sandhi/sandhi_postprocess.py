@@ -7,6 +7,7 @@ import pickle
 from difflib import SequenceMatcher
 from rich import print
 
+from sandhi_splitter import find_shard_paths
 from transliterate_sandhi import transliterate_sandhi
 
 from db.get_db_session import get_db_session
@@ -46,11 +47,10 @@ def process_matches(PTH, neg_inflections_set):
     print("[green]processing matches")
 
     print("reading tsvs")
-    matches_df = pd.read_csv(PTH.matches_path, dtype=str, sep="\t")
+    matches_df = read_matches(PTH.matches_path)
 
     if ADD_DO is True:
-        matches_do_df = pd.read_csv(
-            PTH.matches_do_path, dtype=str, sep="\t")
+        matches_do_df = read_matches(PTH.matches_do_path)
         matches_df = pd.concat([matches_df, matches_do_df], ignore_index=True)
 
     matches_df = matches_df.fillna("")
@@ -113,6 +113,17 @@ def process_matches(PTH, neg_inflections_set):
     return matches_df
 
 
+def read_matches(matches_path):
+    """read matches.tsv and merge in any matches_n.tsv shards
+    from a multiprocess run, in shard order"""
+
+    matches_paths = [matches_path] + find_shard_paths(matches_path)
+    matches_dfs = [
+        pd.read_csv(path, dtype=str, sep="\t") for path in matches_paths]
+
+    return pd.concat(matches_dfs, ignore_index=True)
+
+
 def make_top_five_dict(matches_df):
     print("[green]making top five dict", end=" ")
     top_five_dict = {}
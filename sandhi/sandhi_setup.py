@@ -1,14 +1,17 @@
 #!/usr/bin/env python3.11
+import hashlib
 import re
 import pandas as pd
 import pickle
 
+from pathlib import Path
 from rich import print
 
 from db.models import PaliWord, DerivedData
 from db.get_db_session import get_db_session
 from tools.cst_sc_text_sets import make_sc_text_set
 from tools.cst_sc_text_sets import make_cst_text_set
+from tools.inflection_trie import InflectionTrie
 from tools.tic_toc import tic, toc
 from books_to_include import include
 from tools.paths import ProjectPaths as PTH
@@ -215,6 +218,88 @@ def make_neg_inflections_set(sandhi_exceptions_set):
     return neg_inflections_set
 
 
+def make_sandhi_assets_hash(manual_corrections_dict):
+    """changes when the sandhi rules, the manual corrections
+    or the splitter code change"""
+
+    assets_hash = hashlib.md5()
+    assets_hash.update(PTH.sandhi_rules_path.read_bytes())
+    assets_hash.update(
+        Path(__file__).with_name("sandhi_splitter.py").read_bytes())
+    assets_hash.update(
+        repr(sorted(manual_corrections_dict.items())).encode())
+    return assets_hash.hexdigest()
+
+
+def make_rules_edges():
+    """the most letters a sandhi rule changes at the end of the first
+    word (ch1) and the start of the second word (ch2).
+    fuzzy matches drop one letter, so it's at least one."""
+
+    rules_df = pd.read_csv(PTH.sandhi_rules_path, sep="\t", dtype=str)
+    rules_df.fillna("", inplace=True)
+    max_ch1 = max(rules_df["ch1"].str.len().max(), 1)
+    max_ch2 = max(rules_df["ch2"].str.len().max(), 1)
+    return max_ch1, max_ch2
+
+
+def make_resplit_set(
+        all_inflections_set, unmatched_set, manual_corrections_dict):
+    """compare the inflections and unmatched words with the last setup.
+    only unmatched words which are new, or which contain an inflection
+    which has been added or removed, need to be split again.
+    everything else can reuse its matches from the last run."""
+
+    print(f"[green]{'making resplit set':<35}", end="")
+
+    assets_hash = make_sandhi_assets_hash(manual_corrections_dict)
+
+    try:
+        with open(PTH.all_inflections_set_path, "rb") as f:
+            old_inflections_set = pickle.load(f)
+        with open(PTH.unmatched_set_path, "rb") as f:
+            old_unmatched_set = pickle.load(f)
+        with open(PTH.sandhi_assets_hash_path, "rb") as f:
+            old_assets_hash = pickle.load(f)
+    except FileNotFoundError:
+        old_assets_hash = None
+
+    if old_assets_hash != assets_hash:
+        resplit_set = unmatched_set.copy()
+
+    else:
+        # sandhi rules change up to max_ch1 letters at the end of an
+        # inflection and max_ch2 letters at the start,
+        # so look for what's in between
+        max_ch1, max_ch2 = make_rules_edges()
+        changed_set = old_inflections_set ^ all_inflections_set
+        changed_cores = set(
+            i[max_ch2:len(i) - max_ch1] for i in changed_set)
+
+        if "" in changed_cores:
+            resplit_set = unmatched_set.copy()
+
+        else:
+            changed_trie = InflectionTrie(changed_cores)
+            resplit_set = unmatched_set - old_unmatched_set
+            for word in unmatched_set & old_unmatched_set:
+                if changed_trie.occurs_in(word):
+                    resplit_set.add(word)
+
+    # add words from a setup which was never followed by a splitter run
+    if PTH.resplit_set_path.exists():
+        with open(PTH.resplit_set_path, "rb") as f:
+            resplit_set.update(pickle.load(f) & unmatched_set)
+
+    with open(PTH.resplit_set_path, "wb") as f:
+        pickle.dump(resplit_set, f)
+
+    with open(PTH.sandhi_assets_hash_path, "wb") as f:
+        pickle.dump(assets_hash, f)
+
+    print(f"[white]{len(resplit_set):>10,}")
+
+
 def main():
     tic()
     print("[bright_yellow]setting up for sandhi splitting")
@@ -264,6 +349,10 @@ def main():
 
     text_set, unmatched_set = make_unmatched_set()
 
+    # before the last setup's assets get overwritten
+    make_resplit_set(
+        all_inflections_set, unmatched_set, manual_corrections_dict)
+
     def save_assets():
         print(f"[green]{'saving assets':<35}", end="")
 
@@ -273,6 +362,12 @@ def main():
         with open(PTH.all_inflections_set_path, "wb") as f:
             pickle.dump(all_inflections_set, f)
 
+        with open(PTH.inflections_prefix_trie_path, "wb") as f:
+            pickle.dump(InflectionTrie(all_inflections_set), f)
+
+        with open(PTH.inflections_suffix_trie_path, "wb") as f:
+            pickle.dump(InflectionTrie(all_inflections_set, reverse=True), f)
+
         with open(PTH.text_set_path, "wb") as f:
             pickle.dump(text_set, f)
 
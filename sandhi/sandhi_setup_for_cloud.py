@@ -10,11 +10,13 @@ from pathlib import Path
 from rich import print
 
 from books_to_include import include_for_cloud
+from sandhi_setup import make_resplit_set
 
 from db.models import PaliWord, DerivedData
 from db.get_db_session import get_db_session
 from tools.cst_sc_text_sets import make_cst_text_set
 from tools.cst_sc_text_sets import make_sc_text_set
+from tools.inflection_trie import InflectionTrie
 from tools.tic_toc import tic, toc
 from tools.paths import ProjectPaths as PTH
 
@@ -76,6 +78,10 @@ def main():
 
     text_set, unmatched_set = make_unmatched_set()
 
+    # before the last setup's assets get overwritten
+    make_resplit_set(
+        all_inflections_set, unmatched_set, manual_corrections_dict)
+
     def save_assets():
         print(f"[green]{'saving assets':<35}", end="")
 
@@ -85,6 +91,12 @@ def main():
         with open(PTH.all_inflections_set_path, "wb") as f:
             pickle.dump(all_inflections_set, f)
 
+        with open(PTH.inflections_prefix_trie_path, "wb") as f:
+            pickle.dump(InflectionTrie(all_inflections_set), f)
+
+        with open(PTH.inflections_suffix_trie_path, "wb") as f:
+            pickle.dump(InflectionTrie(all_inflections_set, reverse=True), f)
+
         with open(PTH.text_set_path, "wb") as f:
             pickle.dump(text_set, f)
 
@@ -1,14 +1,20 @@
 #!/usr/bin/env python3.11
 
+import argparse
 import pickle
 import re
 import pandas as pd
 import cProfile
+import multiprocessing
+
+from collections import OrderedDict
+from itertools import islice
 
 from rich import print
-from typing import List
+from typing import Dict
 from os import popen
 
+from tools.inflection_trie import WORD, NEXT_WORD
 from tools.pali_alphabet import vowels
 from tools.tic_toc import tic, toc, bip, bop
 from tools.paths import ProjectPaths as PTH
@@ -37,6 +43,11 @@ global max_matches
 global max_recursions
 global profiler_on
 global max_word_length
+global multiprocess_on
+global processes
+global memo_on
+global memo_max_size
+global incremental_on
 clean_list_max_length = 2
 fuzzy_list_max_length = 4
 clean_word_min_length = 2
@@ -45,6 +56,17 @@ max_matches = 20
 max_recursions = 15
 profiler_on = False
 max_word_length = 100
+multiprocess_on = True
+processes = multiprocessing.cpu_count()
+memo_on = True
+memo_max_size = 200_000
+incremental_on = True
+
+# residual words already split in this run, least recently used first
+memo: OrderedDict = OrderedDict()
+
+# the header row of every matches file
+matches_header = {"word": [("split", "process", "rules", "path")]}
 
 problem_children = [
     "ahirikānottappakodhūpanāhamakkhapaḷāsaissāmacchariyamāyāsāṭheyyathambhasārambhamānātimānamadapamādataṇhāavijjā",
@@ -232,8 +254,11 @@ class Word:
         Word.count_value += 1
         self.count = Word.count_value
         self.word: str = word
-        self.tried: List = set()
+        # comp: the order it was tried in
+        self.tried: Dict[str, int] = {}
         self.matches = set()
+        # the first tried comp a search skipped, see recursion_memo
+        self.oldest_prune: int = 0
 
     @property
     def comp(self):
@@ -263,6 +288,9 @@ def setup():
     global rules
     rules = import_sandhi_rules()
 
+    global rules_index
+    rules_index = make_rules_index(rules)
+
     global shortlist_set
     shortlist_set = make_shortlist_set()
 
@@ -274,20 +302,26 @@ def setup():
     with open(PTH.all_inflections_set_path, "rb") as f:
         all_inflections_set = pickle.load(f)
 
-    global all_inflections_nofirst
-    global all_inflections_nolast
+    global prefix_trie
+    with open(PTH.inflections_prefix_trie_path, "rb") as f:
+        prefix_trie = pickle.load(f)
 
-    (all_inflections_nofirst,
-        all_inflections_nolast) = make_all_inflections_nfl_nll(
-            all_inflections_set)
+    global suffix_trie
+    with open(PTH.inflections_suffix_trie_path, "rb") as f:
+        suffix_trie = pickle.load(f)
 
-    # initalise matches.csv
-    with open(PTH.matches_path, "w") as f:
-        f.write("")
 
-    # initalise timer dict
-    with open(PTH.sandhi_timer_path, "w") as f:
-        f.write("")
+def initialise_output():
+
+    # initalise matches.csv, timer dict and checkpoint
+    for path in make_output_paths():
+        with open(path, "w") as f:
+            f.write("")
+
+    # remove shards from previous multiprocess runs
+    for path in make_output_paths():
+        for shard_path in find_shard_paths(path):
+            shard_path.unlink()
 
 
 def import_sandhi_rules():
@@ -329,6 +363,22 @@ def import_sandhi_rules():
     return sandhi_rules
 
 
+def make_rules_index(rules):
+    """index the sandhi rules by (chA, chB), so that each split point
+    only visits the rules which can actually apply to it"""
+
+    print("[green]indexing sandhi rules", end=" ")
+
+    rules_index = {}
+    for rule, values in rules.items():
+        key = (values["chA"], values["chB"])
+        rules_index.setdefault(key, []).append(rule)
+
+    print(f"[white]{len(rules_index):,}")
+
+    return rules_index
+
+
 def make_shortlist_set():
 
     print("[green]making shortlist set", end=" ")
@@ -343,26 +393,7 @@ def make_shortlist_set():
     return shortlist_set
 
 
-def make_all_inflections_nfl_nll(all_inflections_set):
-    """all inflections with no first letter, no last letter"""
-
-    print("[green]making all inflections nfl & nll", end=" ")
-
-    all_inflections_nofirst = set()
-    all_inflections_nolast = set()
-
-    for inflection in all_inflections_set:
-        # no first letter
-        all_inflections_nofirst.add(inflection[1:])
-        # no last letter
-        all_inflections_nolast.add(inflection[:-1])
-
-    print(f"[white]{len(all_inflections_nofirst):,}")
-
-    return all_inflections_nofirst, all_inflections_nolast
-
-
-def main():
+def main(resume=False):
     tic()
 
     print("[bright_yellow]sandhi splitter")
@@ -378,119 +409,358 @@ def main():
     with open(PTH.matches_dict_path, "rb") as f:
         matches_dict = pickle.load(f)
 
-    time_dict = {}
     global unmatched_len_init
     unmatched_len_init = len(unmatched_set)
 
-    print(f"[green]splitting sandhi [white]{unmatched_len_init:,}")
+    if resume is True:
+        processed_set, matched_set = load_checkpoint()
+        print(f"[green]resuming from checkpoint [white]{len(processed_set):,}")
+        drop_unsaved_matches(processed_set)
+        words = unmatched_set - processed_set
+        unmatched_set.difference_update(matched_set)
+
+    else:
+        if incremental_on is True and PTH.resplit_set_path.exists():
+            words, reused_lines = load_reusable_matches()
+        else:
+            words, reused_lines = unmatched_set.copy(), []
+
+        initialise_output()
+
+        # header row and manual corrections go first
+        save_matches(matches_dict)
+        save_reused_matches(reused_lines, unmatched_set - words)
+
+    # header row and manual corrections are saved
+    matches_dict = {}
+
+    print(f"[green]splitting sandhi [white]{len(words):,}")
+
+    if multiprocess_on is True:
+        word_count, match_count = split_words_multiprocess(words)
+    else:
+        word_count, match_count = split_words(words)
+
+    # the matches are now up to date with the assets
+    PTH.resplit_set_path.unlink(missing_ok=True)
+
+    summary(word_count, match_count)
+    toc()
+
+    if profiler_on:
+        profiler.disable()
+        profiler.dump_stats('profiler.prof')
+        yes_no = input("open profiler? (y/n) ")
+        if yes_no == "y":
+            popen("tuna profiler.prof")
 
-    for counter, word in enumerate(unmatched_set.copy()):
+
+def split_words(words, shard=None):
+    """split every word, flushing matches, times and the checkpoint
+    to disk every 1000 words.
+    returns the total word count and match count."""
+
+    matches_path, timer_path, checkpoint_path = make_output_paths(shard)
+    label = "" if shard is None else f"[{shard}]"
+
+    global matches_dict
+    time_dict = {}
+    processed_list = []
+    word_count = 0
+    match_count = 0
+    words_len = len(words)
+
+    for counter, word in enumerate(words):
         if len(word) <= max_word_length and word not in problem_children:
 
             bip()
-            global w
-            w = Word(word)
-            matches_dict[word] = []
-
-            # d is a dictionary of data accessed using dot notation
-            d: dict = {
-                "count": counter,
-                "comm": "start",
-                "init": word,
-                "front": "",
-                "word": word,
-                "back": "",
-                "rules_front": "",
-                "rules_back": "",
-                "tried": set(),
-                "matches": set(),
-                "path": "start",
-                "processes": 0
-            }
-            d = dotdict(d)
-
-            # debug
-            # if d.init != "aniccabhāvāpattidosadassanatthaṃ":
-            #     continue
-            # if d.count > 1000:
-            #     break
-
-            # two word sandhi
-            d = two_word_sandhi(d)
-
-            # three word sandhi
-            if not w.matches:
-                d = three_word_sandhi(d)
-
-            # # four word sandhi
-            # if not w.matches :
-            #     d = four_word_sandhi(d)
-
-            # # recursive removal
-            if not w.matches:
-                recursive_removal(d)
-
-            # a na an nā
-            if d.word.startswith(("a", "na", "an", "nā")):
-                d = remove_neg(d)
-
-            # sa
-            elif d.word.startswith("sa"):
-                d = remove_sa(d)
-
-            # su
-            elif d.word.startswith("su"):
-                d = remove_su(d)
-
-            # dur
-            elif d.word.startswith("du"):
-                d = remove_dur(d)
-
+            split_word(counter, word)
             time_dict[word] = bop()
+            processed_list.append(word)
 
-            if d.count % 1000 == 0:
+            if counter % 1000 == 0:
                 print(
-                    f"{d.count:>10,} / {unmatched_len_init:<10,}{d.word}")
+                    f"{label}{counter:>10,} / {words_len:<10,}{word}")
 
-                save_matches(matches_dict)
-                save_timer_dict(time_dict)
+                word_count += len(matches_dict)
+                match_count += count_matches(matches_dict)
+                save_matches(matches_dict, matches_path)
+                save_timer_dict(time_dict, timer_path)
+                save_checkpoint(processed_list, checkpoint_path)
                 matches_dict = {}
                 time_dict = {}
+                processed_list = []
 
-    save_matches(matches_dict)
+    word_count += len(matches_dict)
+    match_count += count_matches(matches_dict)
+    save_matches(matches_dict, matches_path)
+    save_checkpoint(processed_list, checkpoint_path)
 
     try:
-        save_timer_dict(time_dict)
+        save_timer_dict(time_dict, timer_path)
     except KeyError as e:
         print(f"[red] {e}")
 
-    summary()
-    toc()
+    return word_count, match_count
 
-    if profiler_on:
-        profiler.disable()
-        profiler.dump_stats('profiler.prof')
-        yes_no = input("open profiler? (y/n) ")
-        if yes_no == "y":
-            popen("tuna profiler.prof")
 
+def split_word(counter, word):
+    """run a single word through all the sandhi splitting processes,
+    adding the results to matches_dict"""
+
+    global w
+    w = Word(word)
+    matches_dict[word] = []
+
+    # d is a dictionary of data accessed using dot notation
+    d: dict = {
+        "count": counter,
+        "comm": "start",
+        "init": word,
+        "front": "",
+        "word": word,
+        "back": "",
+        "rules_front": "",
+        "rules_back": "",
+        "tried": set(),
+        "matches": set(),
+        "path": "start",
+        "processes": 0
+    }
+    d = dotdict(d)
+
+    # debug
+    # if d.init != "aniccabhāvāpattidosadassanatthaṃ":
+    #     return
+
+    # two word sandhi
+    d = two_word_sandhi(d)
+
+    # three word sandhi
+    if not w.matches:
+        d = three_word_sandhi(d)
+
+    # # four word sandhi
+    # if not w.matches :
+    #     d = four_word_sandhi(d)
+
+    # # recursive removal
+    if not w.matches:
+        recursive_removal(d)
+
+    # a na an nā
+    if d.word.startswith(("a", "na", "an", "nā")):
+        d = remove_neg(d)
 
-def save_matches(matches_dict):
+    # sa
+    elif d.word.startswith("sa"):
+        d = remove_sa(d)
+
+    # su
+    elif d.word.startswith("su"):
+        d = remove_su(d)
+
+    # dur
+    elif d.word.startswith("du"):
+        d = remove_dur(d)
+
+
+def split_words_multiprocess(words):
+    """shard the words across a pool of worker processes.
+    the workers are forked after setup(), so they share the read-only
+    inflection sets and rules copy-on-write. each shard writes its own
+    matches_n.tsv, timer_n.tsv and checkpoint_n.tsv,
+    the matches get merged in postprocess."""
+
+    print(f"[green]processes [white]{processes}")
+
+    # deal the words out round robin, so long and short words are mixed
+    words = sorted(words)
+    shards = [(shard, words[shard::processes]) for shard in range(processes)]
+
+    word_count = 0
+    match_count = 0
+
+    context = multiprocessing.get_context("fork")
+    with context.Pool(processes=processes) as pool:
+        for matched_set, shard_word_count, shard_match_count \
+                in pool.imap_unordered(split_shard, shards):
+            unmatched_set.difference_update(matched_set)
+            word_count += shard_word_count
+            match_count += shard_match_count
+
+    return word_count, match_count
+
+
+def split_shard(shard_words):
+    """split one shard of words in a worker process"""
+
+    shard, words = shard_words
+
+    # every shard gets its own header row,
+    # unless it's being resumed
+    matches_path = make_shard_path(PTH.matches_path, shard)
+    if not matches_path.exists():
+        save_matches(matches_header, matches_path)
+
+    global matches_dict
+    matches_dict = {}
+
+    word_count, match_count = split_words(words, shard)
+
+    matched_set = set(words) - unmatched_set
+    return matched_set, word_count, match_count
+
+
+def make_output_paths(shard=None):
+    """matches, timer and checkpoint paths of a run or of one shard"""
+    paths = [
+        PTH.matches_path, PTH.sandhi_timer_path, PTH.sandhi_checkpoint_path]
+    if shard is None:
+        return paths
+    else:
+        return [make_shard_path(path, shard) for path in paths]
+
+
+def make_shard_path(path, shard):
+    """matches.tsv > matches_3.tsv"""
+    return path.with_name(f"{path.stem}_{shard}{path.suffix}")
+
+
+def find_shard_paths(path):
+    """all the shard files of path, in shard order"""
+    shard_paths = []
+    for shard_path in path.parent.glob(f"{path.stem}_*{path.suffix}"):
+        shard = shard_path.stem.replace(f"{path.stem}_", "", 1)
+        if shard.isdigit():
+            shard_paths.append((int(shard), shard_path))
+    return [shard_path for shard, shard_path in sorted(shard_paths)]
+
+
+def count_matches(matches_dict):
+    return sum(len(matches) for matches in matches_dict.values())
+
+
+def matches_lines(matches_dict):
+    """the lines of matches_dict in a matches file"""
+    for word, data in matches_dict.items():
+        for item in data:
+            columns = "".join(f"{column}\t" for column in item)
+            yield f"{word}\t{columns}\n"
+
+
+def save_matches(matches_dict, matches_path=PTH.matches_path):
+
+    with open(matches_path, "a") as f:
+        f.writelines(matches_lines(matches_dict))
+
+
+def save_checkpoint(
+        processed_list, checkpoint_path=PTH.sandhi_checkpoint_path):
+    """append words which have been split and saved to the checkpoint"""
+
+    with open(checkpoint_path, "a") as f:
+        for word in processed_list:
+            f.write(f"{word}\n")
+
+
+def find_output_paths(path):
+    """path and its shards, if they exist.
+    a fresh output dir has none of them."""
+    paths = [path] if path.exists() else []
+    return paths + find_shard_paths(path)
+
+
+def load_checkpoint():
+    """all the words split in previous runs,
+    and those of them which found matches.
+    missing files mean nothing has been split yet."""
+
+    processed_set = set()
+    for path in find_output_paths(PTH.sandhi_checkpoint_path):
+        with open(path) as f:
+            processed_set.update(f.read().splitlines())
+
+    matched_set = set()
+    for path in find_output_paths(PTH.matches_path):
+        with open(path) as f:
+            for line in f:
+                matched_set.add(line.split("\t", 1)[0])
+
+    return processed_set, matched_set & processed_set
+
+
+def drop_unsaved_matches(processed_set):
+    """a run can stop after saving matches but before the checkpoint.
+    remove the lines of words not in the checkpoint from the matches
+    files, so resuming doesn't add them twice.
+    the header rows and manual corrections stay."""
+
+    kept_lines = set(matches_lines(matches_dict))
+    kept_lines.update(matches_lines(matches_header))
+
+    for path in find_output_paths(PTH.matches_path):
+        temp_path = path.with_suffix(".tmp")
+        seen_lines = set()
+        dropped = 0
+        with open(path) as f, open(temp_path, "w") as temp:
+            for line in f:
+                if line.split("\t", 1)[0] in processed_set:
+                    temp.write(line)
+                elif line in kept_lines and line not in seen_lines:
+                    temp.write(line)
+                    seen_lines.add(line)
+                else:
+                    dropped += 1
+
+        if dropped:
+            print(f"[green]dropping unsaved matches [white]{dropped:,}")
+            temp_path.replace(path)
+        else:
+            temp_path.unlink()
+
+
+def load_reusable_matches():
+    """sandhi_setup makes a set of the unmatched words which are new or
+    contain a changed inflection. all the other words split in the last
+    run can keep their matches.
+    returns the words which need splitting and the lines to reuse."""
+
+    with open(PTH.resplit_set_path, "rb") as f:
+        resplit_set = pickle.load(f)
+
+    processed_set, matched_set = load_checkpoint()
+    reuse_set = (unmatched_set - resplit_set) & processed_set
+    print(f"[green]reusing matches [white]{len(reuse_set):,}")
+
+    reused_lines = []
+    for path in find_output_paths(PTH.matches_path):
+        with open(path) as f:
+            for line in f:
+                if line.split("\t", 1)[0] in reuse_set:
+                    reused_lines.append(line)
+
+    return unmatched_set - reuse_set, reused_lines
+
+
+def save_reused_matches(reused_lines, reuse_set):
+    """add the reused lines to matches.tsv and the reused words to the
+    checkpoint, so a resumed run doesn't split them"""
 
     with open(PTH.matches_path, "a") as f:
-        for word, data in matches_dict.items():
-            for item in data:
-                f.write(f"{word}\t")
-                for column in item:
-                    f.write(f"{column}\t")
-                f.write("\n")
+        f.writelines(reused_lines)
+
+    save_checkpoint(sorted(reuse_set))
 
+    unmatched_set.difference_update(
+        line.split("\t", 1)[0] for line in reused_lines)
 
-def save_timer_dict(time_dict):
+
+def save_timer_dict(time_dict, timer_path=PTH.sandhi_timer_path):
     df = pd.DataFrame.from_dict(time_dict, orient="index")
     df = df.sort_values(by=0, ascending=False)
     df.to_csv(
-        PTH.sandhi_timer_path, mode="a", header=None, sep="\t")
+        timer_path, mode="a", header=None, sep="\t")
 
 
 def recursive_removal(d):
@@ -502,8 +772,11 @@ def recursive_removal(d):
 
         # add to matches
 
-        if comp(d) not in w.tried:
-            w.tried.add(comp(d))
+        if comp(d) in w.tried:
+            w.oldest_prune = min(w.oldest_prune, w.tried[comp(d)])
+
+        else:
+            w.tried[comp(d)] = len(w.tried)
             d.tried.add(comp(d))
 
             if d.word in all_inflections_set:
@@ -515,48 +788,127 @@ def recursive_removal(d):
                     d.matches.add(comp(d))
                     unmatched_set.discard(d.init)
 
+            elif memo_on is True and d.processes > 1:
+                recursion_memo(d)
+
             else:
-                # recursion
+                recursion(d)
+
+
+def recursion(d):
+
+    # two word sandhi
+    if d.comm != "start":
+        d = two_word_sandhi(d)
+
+    # ffc = lwff clean
+    d = remove_lwff_clean(d)
+
+    # fff = lwff fuzzy
+    d = remove_lwff_fuzzy(d)
+
+    # api eva iti
+    if re.findall("(pi|va|ti)$", d.word) != []:
+        d = remove_apievaiti(d)
+
+    if not w.matches:
 
-                # two word sandhi
-                if d.comm != "start":
-                    d = two_word_sandhi(d)
+        # fbc = lwfb_clean
+        d = remove_lwfb_clean(d)
 
-                # ffc = lwff clean
-                d = remove_lwff_clean(d)
+        # fbf = lwfb fuzzy
+        d = remove_lwfb_fuzzy(d)
 
-                # fff = lwff fuzzy
-                d = remove_lwff_fuzzy(d)
+    if d.processes == 1:
 
-                # api eva iti
-                if re.findall("(pi|va|ti)$", d.word) != []:
-                    d = remove_apievaiti(d)
+        # a na an nā
+        if d.word.startswith(("a", "na", "an", "nā")):
+            d = remove_neg(d)
 
-                if not w.matches:
+        # sa
+        elif d.word.startswith("sa"):
+            d = remove_sa(d)
 
-                    # fbc = lwfb_clean
-                    d = remove_lwfb_clean(d)
+        # su
+        elif d.word.startswith("su"):
+            d = remove_su(d)
 
-                    # fbf = lwfb fuzzy
-                    d = remove_lwfb_fuzzy(d)
+        # dur
+        elif d.word.startswith("du"):
+            d = remove_dur(d)
 
-                if d.processes == 1:
 
-                    # a na an nā
-                    if d.word.startswith(("a", "na", "an", "nā")):
-                        d = remove_neg(d)
+def recursion_memo(d):
+    """recurse into the residual word only if it hasn't been split before
+    at the same depth, in any word of this run. otherwise replay the
+    splits found last time, inside this word's front and back.
 
-                    # sa
-                    elif d.word.startswith("sa"):
-                        d = remove_sa(d)
+    below the first level, every process only adds to the end of the
+    front, rules_front and path, and the start of the back and rules_back,
+    so the splits and the comps tried are stored relative to the residual.
 
-                    # su
-                    elif d.word.startswith("su"):
-                        d = remove_su(d)
+    a search only depends on the residual and the depth if the word has
+    no matches yet, and the search never skips a comp tried outside it.
+    only those searches are memoized, and replayed only if none of their
+    comps have been tried in this word, so the results are the same as
+    without the memo."""
 
-                    # dur
-                    elif d.word.startswith("du"):
-                        d = remove_dur(d)
+    key = (d.word, d.processes)
+    front = d.front
+    back = d.back
+    rules_front = d.rules_front
+    rules_back = d.rules_back
+    path = d.path
+
+    if key in memo and not w.matches:
+        splits, tried = memo[key]
+        tried = [f"{front}{comp}{back}" for comp in tried]
+
+        if not any(comp in w.tried for comp in tried):
+            memo.move_to_end(key)
+
+            for comp in tried:
+                w.tried[comp] = len(w.tried)
+
+            for split, process, rules, path_end in splits:
+                split = f"{front}{split}{back}"
+                if split not in w.matches:
+                    matches_dict[d.init] += [(
+                        split, process, f"{rules_front}{rules}{rules_back}",
+                        f"{path}{path_end}")]
+                    w.matches.add(split)
+                    d.matches.add(split)
+                    unmatched_set.discard(d.init)
+            return
+
+    memoize = not w.matches
+    matches_len = len(matches_dict[d.init])
+    tried_start = len(w.tried)
+    oldest_prune = w.oldest_prune
+    w.oldest_prune = tried_start
+
+    recursion(d)
+
+    # the search skipped a comp tried before it started
+    if w.oldest_prune < tried_start:
+        memoize = False
+    w.oldest_prune = min(oldest_prune, w.oldest_prune)
+
+    if memoize and len(w.matches) < max_matches:
+        splits = [
+            (split[len(front):len(split)-len(back)],
+                process,
+                rules[len(rules_front):len(rules)-len(rules_back)],
+                path_full[len(path):])
+            for split, process, rules, path_full
+            in matches_dict[d.init][matches_len:]]
+        tried = [
+            comp[len(front):len(comp)-len(back)]
+            for comp in islice(w.tried, tried_start, None)]
+        memo[key] = (splits, tried)
+
+        if len(memo) > memo_max_size:
+            memo.popitem(last=False)
 
 
 def remove_neg(d):
@@ -752,49 +1104,78 @@ def remove_apievaiti(d):
             wordA = d.word[:-2]
             wordB = d.word[-2:]
 
-        for rule in rules:
-            chA = rules[rule]["chA"]
-            chB = rules[rule]["chB"]
+        try:
+            wordA_lastletter = wordA[-1]
+        except Exception:
+            wordA_lastletter = wordA
+        wordB_firstletter = wordB[0]
+
+        for rule in rules_index.get(
+                (wordA_lastletter, wordB_firstletter), []):
             ch1 = rules[rule]["ch1"]
             ch2 = rules[rule]["ch2"]
 
-            try:
-                wordA_lastletter = wordA[-1]
-            except Exception:
-                wordA_lastletter = wordA
-            wordB_firstletter = wordB[0]
-
-            if (wordA_lastletter == chA and
-                    wordB_firstletter == chB):
-                word1 = wordA[:-1] + ch1
-                word2 = ch2 + wordB[1:]
+            word1 = wordA[:-1] + ch1
+            word2 = ch2 + wordB[1:]
 
-                if word2 in ["api", "eva", "iti"]:
-                    d.word = d.word.replace(wordB, "")
-                    d.word = d.word.replace(wordA, word1)
-                    d.back = f" + {word2}{d.back}"
-                    d.comm = "apievaiti"
-                    d.rules_back = f"{rule+2},{d.rules_back}"
-                    d.path += " > apievaiti"
+            if word2 in ["api", "eva", "iti"]:
+                d.word = d.word.replace(wordB, "")
+                d.word = d.word.replace(wordA, word1)
+                d.back = f" + {word2}{d.back}"
+                d.comm = "apievaiti"
+                d.rules_back = f"{rule+2},{d.rules_back}"
+                d.path += " > apievaiti"
 
-                    if d.word in all_inflections_set:
-                        d.comm == f"match! = {comp(d)}"
+                if d.word in all_inflections_set:
+                    d.comm == f"match! = {comp(d)}"
 
-                        if comp(d) not in w.matches:
-                            matches_dict[d.init] += [
-                                (comp(d), "xword-pi", "apievaiti", d.path)]
-                            w.matches.add(comp(d))
-                            d.matches.add(comp(d))
-                            unmatched_set.discard(d.init)
+                    if comp(d) not in w.matches:
+                        matches_dict[d.init] += [
+                            (comp(d), "xword-pi", "apievaiti", d.path)]
+                        w.matches.add(comp(d))
+                        d.matches.add(comp(d))
+                        unmatched_set.discard(d.init)
 
-                    else:
-                        recursive_removal(d)
+                else:
+                    recursive_removal(d)
 
-                    d = dotdict(d_orig)
+                d = dotdict(d_orig)
 
     return d_orig
 
 
+def find_front_words(word, flags):
+    """all the inflections (WORD) or inflections less their last letter
+    (NEXT_WORD) which word starts with, in one walk of the prefix trie.
+    same order as testing word[:-i] for i in range(len(word)),
+    i.e. the empty string first, then longest to shortest."""
+
+    found = [
+        length for length, node_flags in prefix_trie.walk(word)
+        if node_flags & flags and length < len(word)]
+
+    if found and found[0] == 0:
+        found = [0] + found[:0:-1]
+    else:
+        found.reverse()
+
+    return [word[:length] for length in found]
+
+
+def find_back_words(word, flags):
+    """all the inflections (WORD) or inflections less their first letter
+    (NEXT_WORD) which word ends with, in one walk of the suffix trie.
+    same order as testing word[i:] for i in range(len(word)),
+    i.e. longest to shortest."""
+
+    found = [
+        length for length, node_flags in suffix_trie.walk(word)
+        if node_flags & flags and length > 0]
+    found.reverse()
+
+    return [word[-length:] for length in found]
+
+
 def remove_lwff_clean(d):
     """make a list of the longest clean words from the front then
     1. match 2. recurse or 3. pass through"""
@@ -803,11 +1184,7 @@ def remove_lwff_clean(d):
 
     if comp(d) not in w.matches:
 
-        lwff_clean_list = []
-
-        for i in range(len(d.word)):
-            if d.word[:-i] in all_inflections_set:
-                lwff_clean_list.append(d.word[:-i])
+        lwff_clean_list = find_front_words(d.word, WORD)
 
         lwff_clean_list = lwff_clean_list[:clean_list_max_length]
 
@@ -846,11 +1223,7 @@ def remove_lwfb_clean(d):
 
     if comp(d) not in w.matches:
 
-        lwfb_clean_list = []
-
-        for i in range(len(d.word)):
-            if d.word[i:] in all_inflections_set:
-                lwfb_clean_list.append(d.word[i:])
+        lwfb_clean_list = find_back_words(d.word, WORD)
 
         lwfb_clean_list = lwfb_clean_list[:clean_list_max_length]
 
@@ -891,12 +1264,7 @@ def remove_lwff_fuzzy(d):
         lwff_fuzzy_list = []
 
         if len(d.word) >= fuzzy_word_min_length:
-            for i in range(len(d.word)):
-                fuzzy_word = d.word[:-i]
-
-                if (fuzzy_word in all_inflections_nolast or
-                        fuzzy_word in all_inflections_set):
-                    lwff_fuzzy_list.append(fuzzy_word)
+            lwff_fuzzy_list = find_front_words(d.word, WORD | NEXT_WORD)
 
         lwff_fuzzy_list = lwff_fuzzy_list[:fuzzy_list_max_length]
 
@@ -916,41 +1284,38 @@ def remove_lwff_fuzzy(d):
                 except Exception:
                     wordB_firstletter = ""
 
-                for rule in rules:
-                    chA = rules[rule]["chA"]
-                    chB = rules[rule]["chB"]
+                for rule in rules_index.get(
+                        (wordA_lastletter, wordB_firstletter), []):
                     ch1 = rules[rule]["ch1"]
                     ch2 = rules[rule]["ch2"]
 
-                    if (wordA_lastletter == chA and
-                            wordB_firstletter == chB):
-                        word1 = wordA_fuzzy[:-1] + ch1
-                        word2 = ch2 + wordB_fuzzy[1:]
-
-                        if word1 in all_inflections_set:
-                            d.path += " > front_fuzzy"
-                            d.word = re.sub(
-                                f"^{wordA_fuzzy}", "", d.word, count=1)
-                            d.word = re.sub(
-                                f"^{wordB_fuzzy}", word2, d.word, count=1)
-                            d.front = f"{d.front}{word1} + "
-                            d.comm = f"lwff_fuzzy [yellow]{word1} + {word2}"
-                            d.rules_front += f"{rule+2},"
+                    word1 = wordA_fuzzy[:-1] + ch1
+                    word2 = ch2 + wordB_fuzzy[1:]
+
+                    if word1 in all_inflections_set:
+                        d.path += " > front_fuzzy"
+                        d.word = re.sub(
+                            f"^{wordA_fuzzy}", "", d.word, count=1)
+                        d.word = re.sub(
+                            f"^{wordB_fuzzy}", word2, d.word, count=1)
+                        d.front = f"{d.front}{word1} + "
+                        d.comm = f"lwff_fuzzy [yellow]{word1} + {word2}"
+                        d.rules_front += f"{rule+2},"
 
-                            if d.word in all_inflections_set:
-                                if comp(d) not in w.matches:
-                                    matches_dict[d.init] += [(
-                                        comp(d), "xword-fff",
-                                        f"{comp_rules(d)}", d.path)]
-                                    w.matches.add(comp(d))
-                                    d.matches.add(comp(d))
-                                    unmatched_set.discard(d.init)
+                        if d.word in all_inflections_set:
+                            if comp(d) not in w.matches:
+                                matches_dict[d.init] += [(
+                                    comp(d), "xword-fff",
+                                    f"{comp_rules(d)}", d.path)]
+                                w.matches.add(comp(d))
+                                d.matches.add(comp(d))
+                                unmatched_set.discard(d.init)
 
-                            else:
-                                d.comm = f"recursing lwff_fuzzy {comp(d)}"
-                                recursive_removal(d)
+                        else:
+                            d.comm = f"recursing lwff_fuzzy {comp(d)}"
+                            recursive_removal(d)
 
-                            d = dotdict(d_orig)
+                        d = dotdict(d_orig)
 
     return d_orig
 
@@ -966,12 +1331,7 @@ def remove_lwfb_fuzzy(d):
         lwfb_fuzzy_list = []
 
         if len(d.word) > 0:
-            for i in range(len(d.word)):
-                fuzzy_word = d.word[i:]
-
-                if (fuzzy_word in all_inflections_nofirst or
-                        fuzzy_word in all_inflections_set):
-                    lwfb_fuzzy_list.append(fuzzy_word)
+            lwfb_fuzzy_list = find_back_words(d.word, WORD | NEXT_WORD)
 
         lwfb_fuzzy_list = lwfb_fuzzy_list[:fuzzy_list_max_length]
 
@@ -990,43 +1350,40 @@ def remove_lwfb_fuzzy(d):
                 except Exception:
                     wordB_firstletter = ""
 
-                for rule in rules:
-                    chA = rules[rule]["chA"]
-                    chB = rules[rule]["chB"]
+                for rule in rules_index.get(
+                        (wordA_lastletter, wordB_firstletter), []):
                     ch1 = rules[rule]["ch1"]
                     ch2 = rules[rule]["ch2"]
 
-                    if (wordA_lastletter == chA and
-                            wordB_firstletter == chB):
-                        word1 = wordA_fuzzy[:-1] + ch1
-                        word2 = ch2 + wordB_fuzzy[1:]
-
-                        if word2 in all_inflections_set:
-                            d.path += " > back_fuzzy"
-                            d.word = re.sub(
-                                f"{wordB_fuzzy}$", "", d.word, count=1)
-                            d.word = re.sub(
-                                f"{wordA_fuzzy}$", word1, d.word, count=1)
-                            # d.back = re.sub(
-                            #     f"{wordB_fuzzy}$", word2, d.back, count=1)
-                            d.back = f" + {word2}{d.back}"
-                            d.comm = f"lwfb_fuzzy [yellow]{word1} + {word2}"
-                            d.rules_back = f"{rule+2},{d.rules_back}"
-
-                            if d.word in all_inflections_set:
-                                if comp(d) not in w.matches:
-                                    matches_dict[d.init] += [(
-                                        comp(d), "xword-fbf",
-                                        f"{comp_rules(d)}", d.path)]
-                                    w.matches.add(comp(d))
-                                    d.matches.add(comp(d))
-                                    unmatched_set.discard(d.init)
+                    word1 = wordA_fuzzy[:-1] + ch1
+                    word2 = ch2 + wordB_fuzzy[1:]
+
+                    if word2 in all_inflections_set:
+                        d.path += " > back_fuzzy"
+                        d.word = re.sub(
+                            f"{wordB_fuzzy}$", "", d.word, count=1)
+                        d.word = re.sub(
+                            f"{wordA_fuzzy}$", word1, d.word, count=1)
+                        # d.back = re.sub(
+                        #     f"{wordB_fuzzy}$", word2, d.back, count=1)
+                        d.back = f" + {word2}{d.back}"
+                        d.comm = f"lwfb_fuzzy [yellow]{word1} + {word2}"
+                        d.rules_back = f"{rule+2},{d.rules_back}"
+
+                        if d.word in all_inflections_set:
+                            if comp(d) not in w.matches:
+                                matches_dict[d.init] += [(
+                                    comp(d), "xword-fbf",
+                                    f"{comp_rules(d)}", d.path)]
+                                w.matches.add(comp(d))
+                                d.matches.add(comp(d))
+                                unmatched_set.discard(d.init)
 
-                            else:
-                                d.comm = f"recursing lwfb_fuzzy {comp(d)}"
-                                recursive_removal(d)
+                        else:
+                            d.comm = f"recursing lwfb_fuzzy {comp(d)}"
+                            recursive_removal(d)
 
-                            d = dotdict(d_orig)
+                        d = dotdict(d_orig)
 
     return d_orig
 
@@ -1074,36 +1431,33 @@ def two_word_sandhi(d):
 
             # bla* *lah
 
-            for rule in rules:
-                chA = rules[rule]["chA"]
-                chB = rules[rule]["chB"]
+            for rule in rules_index.get(
+                    (wordA_lastletter, wordB_firstletter), []):
                 ch1 = rules[rule]["ch1"]
                 ch2 = rules[rule]["ch2"]
 
-                if (wordA_lastletter == chA and
-                        wordB_firstletter == chB):
-                    word1 = wordA[:-1] + ch1
-                    word2 = ch2 + wordB[1:]
+                word1 = wordA[:-1] + ch1
+                word2 = ch2 + wordB[1:]
 
-                    if (word1 in all_inflections_set and
-                            word2 in all_inflections_set):
-                        d.front = f"{d.front}{word1} + "
-                        d.word = word2
-                        d.rules_front += f"{rule+2},"
-                        d.path += " > 2.2"
-                        if d.comm == "start":
-                            d.comm = "start2.2"
-                        else:
-                            d.comm = "x2.2"
+                if (word1 in all_inflections_set and
+                        word2 in all_inflections_set):
+                    d.front = f"{d.front}{word1} + "
+                    d.word = word2
+                    d.rules_front += f"{rule+2},"
+                    d.path += " > 2.2"
+                    if d.comm == "start":
+                        d.comm = "start2.2"
+                    else:
+                        d.comm = "x2.2"
 
-                        if comp(d) not in w.matches:
-                            matches_dict[d.init] += [
-                                (comp(d), d.comm, f"{comp_rules(d)}", d.path)]
-                            w.matches.add(comp(d))
-                            d.matches.add(comp(d))
-                            unmatched_set.discard(d.init)
+                    if comp(d) not in w.matches:
+                        matches_dict[d.init] += [
+                            (comp(d), d.comm, f"{comp_rules(d)}", d.path)]
+                        w.matches.add(comp(d))
+                        d.matches.add(comp(d))
+                        unmatched_set.discard(d.init)
 
-                    d = dotdict(d_orig)
+                d = dotdict(d_orig)
 
     return d_orig
 
@@ -1167,130 +1521,118 @@ def three_word_sandhi(d):
                 # blah bla* *lah
                 if wordA in all_inflections_set:
 
-                    for rule in rules:
-                        chA = rules[rule]["chA"]
-                        chB = rules[rule]["chB"]
+                    for rule in rules_index.get(
+                            (wordB_lastletter, wordC_firstletter), []):
                         ch1 = rules[rule]["ch1"]
                         ch2 = rules[rule]["ch2"]
 
-                        if (wordB_lastletter == chA and
-                                wordC_firstletter == chB):
-                            word2 = wordB[:-1] + ch1
-                            word3 = ch2 + wordC[1:]
+                        word2 = wordB[:-1] + ch1
+                        word3 = ch2 + wordC[1:]
 
-                            if (wordA in all_inflections_set and
-                                word2 in all_inflections_set and
-                                    word3 in all_inflections_set):
-
-                                d.front = f"{d.front}{wordA} + "
-                                d.word = word2
-                                d.back = f" + {word3}{d.back}"
-                                d.rules_front += "0,"
-                                d.rules_back = f"{rule+2},{d.rules_back}"
-                                d.path += " > 3.2"
-                                if d.comm == "start":
-                                    d.comm = "start3.2"
-                                else:
-                                    d.comm = "x3.2"
-
-                                if comp(d) not in w.matches:
-                                    matches_dict[d.init] += [(
-                                        comp(d), d.comm,
-                                        f"{comp_rules(d)}", d.path)]
-                                    w.matches.add(comp(d))
-                                    d.matches.add(comp(d))
-                                    unmatched_set.discard(d.init)
-
-                                d = dotdict(d_orig)
+                        if (wordA in all_inflections_set and
+                            word2 in all_inflections_set and
+                                word3 in all_inflections_set):
+
+                            d.front = f"{d.front}{wordA} + "
+                            d.word = word2
+                            d.back = f" + {word3}{d.back}"
+                            d.rules_front += "0,"
+                            d.rules_back = f"{rule+2},{d.rules_back}"
+                            d.path += " > 3.2"
+                            if d.comm == "start":
+                                d.comm = "start3.2"
+                            else:
+                                d.comm = "x3.2"
+
+                            if comp(d) not in w.matches:
+                                matches_dict[d.init] += [(
+                                    comp(d), d.comm,
+                                    f"{comp_rules(d)}", d.path)]
+                                w.matches.add(comp(d))
+                                d.matches.add(comp(d))
+                                unmatched_set.discard(d.init)
+
+                            d = dotdict(d_orig)
 
                 # bla* *lah blah
 
                 if wordC in all_inflections_set:
 
-                    for rule in rules:
-                        chA = rules[rule]["chA"]
-                        chB = rules[rule]["chB"]
+                    for rule in rules_index.get(
+                            (wordA_lastletter, wordB_firstletter), []):
                         ch1 = rules[rule]["ch1"]
                         ch2 = rules[rule]["ch2"]
 
-                        if (wordA_lastletter == chA and
-                                wordB_firstletter == chB):
-                            word1 = wordA[:-1] + ch1
-                            word2 = ch2 + wordB[1:]
+                        word1 = wordA[:-1] + ch1
+                        word2 = ch2 + wordB[1:]
 
-                            if (word1 in all_inflections_set and
-                                word2 in all_inflections_set and
-                                    wordC in all_inflections_set):
-
-                                d.front = f"{d.front}{word1} + "
-                                d.word = word2
-                                d.back = f" + {wordC}{d.back}"
-                                d.rules_front += f"{rule+2},"
-                                d.rules_back = f"0,{d.rules_back}"
-                                d.path += " > 3.3"
-                                if d.comm == "start":
-                                    d.comm = "start3.3"
-                                else:
-                                    d.comm = "x3.3"
-
-                                if comp(d) not in w.matches:
-                                    matches_dict[d.init] += [(
-                                        comp(d), d.comm,
-                                        f"{comp_rules(d)}", d.path)]
-                                    w.matches.add(comp(d))
-                                    d.matches.add(comp(d))
-                                    unmatched_set.discard(d.init)
-
-                                d = dotdict(d_orig)
+                        if (word1 in all_inflections_set and
+                            word2 in all_inflections_set and
+                                wordC in all_inflections_set):
+
+                            d.front = f"{d.front}{word1} + "
+                            d.word = word2
+                            d.back = f" + {wordC}{d.back}"
+                            d.rules_front += f"{rule+2},"
+                            d.rules_back = f"0,{d.rules_back}"
+                            d.path += " > 3.3"
+                            if d.comm == "start":
+                                d.comm = "start3.3"
+                            else:
+                                d.comm = "x3.3"
+
+                            if comp(d) not in w.matches:
+                                matches_dict[d.init] += [(
+                                    comp(d), d.comm,
+                                    f"{comp_rules(d)}", d.path)]
+                                w.matches.add(comp(d))
+                                d.matches.add(comp(d))
+                                unmatched_set.discard(d.init)
+
+                            d = dotdict(d_orig)
 
                 # bla* *la* *lah
 
-                for rulex in rules:
-                    chAx = rules[rulex]["chA"]
-                    chBx = rules[rulex]["chB"]
+                for rulex in rules_index.get(
+                        (wordA_lastletter, wordB_firstletter), []):
                     ch1x = rules[rulex]["ch1"]
                     ch2x = rules[rulex]["ch2"]
 
-                    if (wordA_lastletter == chAx and
-                            wordB_firstletter == chBx):
-                        word1 = wordA[:-1] + ch1x
-                        word2 = ch2x + wordB[1:]
+                    word1 = wordA[:-1] + ch1x
+                    word2 = ch2x + wordB[1:]
 
-                        for ruley in rules:
-                            chAy = rules[ruley]["chA"]
-                            chBy = rules[ruley]["chB"]
-                            ch1y = rules[ruley]["ch1"]
-                            ch2y = rules[ruley]["ch2"]
+                    for ruley in rules_index.get(
+                            (wordB_lastletter, wordC_firstletter), []):
+                        ch1y = rules[ruley]["ch1"]
+                        ch2y = rules[ruley]["ch2"]
 
-                            if (wordB_lastletter == chAy and
-                                    wordC_firstletter == chBy):
-                                word2 = (ch2x + wordB[1:])[:-1] + ch1y
-                                word3 = ch2y + wordC[1:]
-
-                                if (word1 in all_inflections_set and
-                                        word2 in all_inflections_set and
-                                        word3 in all_inflections_set):
-
-                                    d.front = f"{d.front}{word1} + "
-                                    d.word = word2
-                                    d.back = f" + {word3}{d.back}"
-                                    d.rules_front += f"{rulex+2},"
-                                    d.rules_back = f"{ruley+2},{d.rules_back}"
-                                    d.path += " > 3.4"
-                                    if d.comm == "start":
-                                        d.comm = "start3.4"
-                                    else:
-                                        d.comm = "x3.4"
+                        word2 = (ch2x + wordB[1:])[:-1] + ch1y
+                        word3 = ch2y + wordC[1:]
 
-                                    if comp(d) not in w.matches:
-                                        matches_dict[d.init] += [(
-                                            comp(d), d.comm,
-                                            f"{comp_rules(d)}", d.path)]
-                                        w.matches.add(comp(d))
-                                        d.matches.add(comp(d))
-                                        unmatched_set.discard(d.init)
+                        if (word1 in all_inflections_set and
+                                word2 in all_inflections_set and
+                                word3 in all_inflections_set):
 
-                                    d = dotdict(d_orig)
+                            d.front = f"{d.front}{word1} + "
+                            d.word = word2
+                            d.back = f" + {word3}{d.back}"
+                            d.rules_front += f"{rulex+2},"
+                            d.rules_back = f"{ruley+2},{d.rules_back}"
+                            d.path += " > 3.4"
+                            if d.comm == "start":
+                                d.comm = "start3.4"
+                            else:
+                                d.comm = "x3.4"
+
+                            if comp(d) not in w.matches:
+                                matches_dict[d.init] += [(
+                                    comp(d), d.comm,
+                                    f"{comp_rules(d)}", d.path)]
+                                w.matches.add(comp(d))
+                                d.matches.add(comp(d))
+                                unmatched_set.discard(d.init)
+
+                            d = dotdict(d_orig)
 
     return d_orig
 
@@ -1324,66 +1666,57 @@ def four_word_sandhi(d):
 
                     # bla* *la* *la* *lah
 
-                    for rulex in rules:
-                        chAx = rules[rulex]["chA"]
-                        chBx = rules[rulex]["chB"]
+                    for rulex in rules_index.get(
+                            (wordA_lastletter, wordB_firstletter), []):
                         ch1x = rules[rulex]["ch1"]
                         ch2x = rules[rulex]["ch2"]
 
-                        if (wordA_lastletter == chAx and
-                                wordB_firstletter == chBx):
-                            word1 = wordA[:-1] + ch1x
-                            word2 = ch2x + wordB[1:]
-
-                            for ruley in rules:
-                                chAy = rules[ruley]["chA"]
-                                chBy = rules[ruley]["chB"]
-                                ch1y = rules[ruley]["ch1"]
-                                ch2y = rules[ruley]["ch2"]
-
-                                if wordB_lastletter == chAy and \
-                                        wordC_firstletter == chBy:
-                                    word2 = (ch2x + wordB[1:])[:-1] + ch1y
-                                    word3 = ch2y + wordC[1:]
-
-                                    for rulez in rules:
-                                        chAz = rules[rulez]["chA"]
-                                        chBz = rules[rulez]["chB"]
-                                        ch1z = rules[rulez]["ch1"]
-                                        ch2z = rules[rulez]["ch2"]
-
-                                        if (wordC_lastletter == chAz and
-                                                wordD_firstletter == chBz):
-                                            word3 = (
-                                                ch2y + wordC[1:])[:-1] + ch1z
-                                            word4 = ch2z + wordD[1:]
-
-                                            if (word1 in all_inflections_set
-                                                and
-                                                word2 in all_inflections_set
-                                                and
-                                                word3 in all_inflections_set
-                                                and
-                                                    word4 in all_inflections_set):
-                                                d.front = f"{d.front}{word1} + {word2} + "
-                                                d.word = word3
-                                                d.back = f" + {word4}{d.back}"
-                                                d.rules_front += f"{rulex+2},{ruley+2}"
-                                                d.rules_back = f"{rulez+2},{d.rules_back}"
-                                                d.path += " > 4"
-                                                d.comm = "x4"
-
-                                                if comp(d) not in w.matches:
-                                                    matches_dict[d.init] += [(
-                                                        comp(d), d.comm,
-                                                        f"{comp_rules(d)}",
-                                                        d.path)]
-                                                    w.matches.add(comp(d))
-                                                    d.matches.add(comp(d))
-                                                    unmatched_set.discard(
-                                                        d.init)
-
-                                                d = dotdict(d_orig)
+                        word1 = wordA[:-1] + ch1x
+                        word2 = ch2x + wordB[1:]
+
+                        for ruley in rules_index.get(
+                                (wordB_lastletter, wordC_firstletter), []):
+                            ch1y = rules[ruley]["ch1"]
+                            ch2y = rules[ruley]["ch2"]
+
+                            word2 = (ch2x + wordB[1:])[:-1] + ch1y
+                            word3 = ch2y + wordC[1:]
+
+                            for rulez in rules_index.get(
+                                    (wordC_lastletter, wordD_firstletter), []):
+                                ch1z = rules[rulez]["ch1"]
+                                ch2z = rules[rulez]["ch2"]
+
+                                word3 = (
+                                    ch2y + wordC[1:])[:-1] + ch1z
+                                word4 = ch2z + wordD[1:]
+
+                                if (word1 in all_inflections_set
+                                    and
+                                    word2 in all_inflections_set
+                                    and
+                                    word3 in all_inflections_set
+                                    and
+                                        word4 in all_inflections_set):
+                                    d.front = f"{d.front}{word1} + {word2} + "
+                                    d.word = word3
+                                    d.back = f" + {word4}{d.back}"
+                                    d.rules_front += f"{rulex+2},{ruley+2}"
+                                    d.rules_back = f"{rulez+2},{d.rules_back}"
+                                    d.path += " > 4"
+                                    d.comm = "x4"
+
+                                    if comp(d) not in w.matches:
+                                        matches_dict[d.init] += [(
+                                            comp(d), d.comm,
+                                            f"{comp_rules(d)}",
+                                            d.path)]
+                                        w.matches.add(comp(d))
+                                        d.matches.add(comp(d))
+                                        unmatched_set.discard(
+                                            d.init)
+
+                                    d = dotdict(d_orig)
 
     return d_orig
 
@@ -1409,7 +1742,7 @@ def dprint(d):
     print()
 
 
-def summary():
+def summary(word_count, match_count):
 
     print("[green]writing unmatched set")
 
@@ -1427,12 +1760,6 @@ def summary():
     print(
         f"[green]matched:\t{matched:,} / {unmatched_len_init:,}\t[white]{matched_perc:.2f}%")
 
-    word_count = len(matches_dict)
-    match_count = 0
-
-    for word, matches in matches_dict.items():
-        match_count += len(matches)
-
     match_average = match_count / word_count
 
     print(f"[green]match count:\t{match_count:,}")
@@ -1440,7 +1767,12 @@ def summary():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="sandhi splitter")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="carry on from the last checkpoint, skipping words already split")
+    args = parser.parse_args()
+    main(resume=args.resume)
 
 
 # add ttā and its inflections to all inflections
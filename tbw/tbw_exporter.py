@@ -8,7 +8,7 @@ from db.get_db_session import get_db_session
 from db.models import PaliWord, Sandhi, DerivedData
 from tools.pali_sort_key import pali_sort_key
 from tools.tic_toc import tic, toc
-from tools.cst_sc_text_sets import make_sc_text_set
+from tools.corpus_frequency import load_corpus_frequency
 from tools.meaning_construction import make_meaning_html
 from tools.meaning_construction import summarize_constr
 from tools.paths import ProjectPaths as PTH
@@ -19,18 +19,7 @@ def main():
     print("[bright_yellow]exporting json files for the buddhas words website")
     print(f"[green]{'making sutta central ebts word list':<40}", end="")
 
-    sc_text_list = [
-        "vin1", "vin2", "vin3", "vin4", "vin5",
-        "dn1", "dn2", "dn3",
-        "mn1", "mn2", "mn3",
-        "sn1", "sn2", "sn3", "sn4", "sn5",
-        "an1", "an2", "an3", "an4", "an5",
-        "an6", "an7", "an8", "an9", "an10", "an11",
-        "kn1", "kn2", "kn3", "kn4", "kn5",
-        "kn8", "kn9",
-        ]
-
-    tbw_word_set: set = make_sc_text_set(sc_text_list)
+    tbw_word_set: set = load_corpus_frequency(PTH).words_in("sc_ebts")
     print(f"{len(tbw_word_set):,}")
 
     # -------------------------------------------------------------------------------
@@ -0,0 +1,190 @@
+"""Tests of the sandhi splitter on a small made-up corpus.
+Run from the project root:
+pytest tests/test_sandhi_splitter.py"""
+
+import os
+import pickle
+import random
+import sys
+
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1].joinpath("sandhi")))
+
+import sandhi_splitter  # noqa: E402
+from tools.inflection_trie import InflectionTrie  # noqa: E402
+from tools.paths import ProjectPaths as PTH  # noqa: E402
+
+
+def make_assets(tmp_path, monkeypatch, word_count=3000, long_word_count=0):
+    """a fixed sample of inflections, rules and unmatched words,
+    in an empty project dir"""
+
+    monkeypatch.chdir(tmp_path)
+    PTH.create_dirs()
+    PTH.resplit_set_path.parent.mkdir(parents=True, exist_ok=True)
+
+    random.seed(1)
+    letters = "aāiīuūkgcjtdnpbmyrlvsh"
+    vowels = "aāiīuū"
+
+    rules = {}
+    for chA in vowels:
+        for chB in vowels:
+            rules[len(rules)] = {
+                "chA": chA, "chB": chB,
+                "ch1": random.choice(vowels), "ch2": random.choice(vowels)}
+
+    def random_word(length):
+        return "".join(random.choice(letters) for x in range(length))
+
+    inflections = set(
+        random_word(random.randint(2, 5)) for x in range(3000))
+    inflections.update(["api", "eva", "iti"])
+    inflections_list = sorted(inflections)
+    words = set(
+        "".join(
+            random.choice(inflections_list)
+            for x in range(random.randint(2, 4)))
+        for x in range(word_count))
+    words = words - inflections
+
+    # long compounds only split by recursive removal,
+    # and share their last three words, so their residuals repeat
+    if long_word_count:
+        long_inflections = [i for i in inflections_list if len(i) >= 4]
+        tails = [
+            "".join(random.choice(long_inflections) for x in range(3))
+            for x in range(5)]
+        words.update(
+            "".join(
+                random.choice(long_inflections)
+                for x in range(random.randint(2, 3)))
+            + random.choice(tails)
+            for x in range(long_word_count))
+
+    with open(PTH.unmatched_set_path, "wb") as f:
+        pickle.dump(words, f)
+    with open(PTH.all_inflections_set_path, "wb") as f:
+        pickle.dump(inflections, f)
+    with open(PTH.inflections_prefix_trie_path, "wb") as f:
+        pickle.dump(InflectionTrie(inflections), f)
+    with open(PTH.inflections_suffix_trie_path, "wb") as f:
+        pickle.dump(InflectionTrie(inflections, reverse=True), f)
+    with open(PTH.matches_dict_path, "wb") as f:
+        pickle.dump({"word": [("split", "process", "rules", "path")]}, f)
+
+    monkeypatch.setattr(sandhi_splitter, "import_sandhi_rules", lambda: rules)
+    monkeypatch.setattr(sandhi_splitter, "make_shortlist_set", lambda: set())
+    monkeypatch.setattr(sandhi_splitter, "multiprocess_on", False)
+
+    return words
+
+
+class CountingMemo(OrderedDict):
+    """the splitter's memo, counting the searches it replays,
+    and those which replay any splits"""
+
+    def __init__(self):
+        super().__init__()
+        self.last_value = None
+        self.replays = 0
+        self.replays_with_splits = 0
+
+    def __getitem__(self, key):
+        self.last_value = super().__getitem__(key)
+        return self.last_value
+
+    def move_to_end(self, key, last=True):
+        # only called when a search is replayed
+        self.replays += 1
+        splits, tried = self.last_value
+        if splits:
+            self.replays_with_splits += 1
+        super().move_to_end(key, last)
+
+
+def run_splitter(resume=False):
+    """split every word in a fresh process state,
+    returns the lines of matches.tsv of each word, in order"""
+
+    sandhi_splitter.memo.clear()
+    sandhi_splitter.main(resume=resume)
+
+    word_lines = {}
+    with open(PTH.matches_path) as f:
+        for line in f:
+            word = line.split("\t", 1)[0]
+            word_lines.setdefault(word, []).append(line)
+    return word_lines
+
+
+def test_fresh_output_dir_with_resplit_set(tmp_path, monkeypatch):
+    """the first run after setup has a resplit set,
+    but no checkpoint or matches yet"""
+
+    words = make_assets(tmp_path, monkeypatch, word_count=300)
+    with open(PTH.resplit_set_path, "wb") as f:
+        pickle.dump(set(sorted(words)[:10]), f)
+    for path in os.listdir(PTH.sandhi_output_dir):
+        if path.endswith(".tsv"):
+            PTH.sandhi_output_dir.joinpath(path).unlink()
+
+    word_lines = run_splitter()
+
+    assert "word" in word_lines
+    assert PTH.sandhi_checkpoint_path.exists()
+    with open(PTH.sandhi_checkpoint_path) as f:
+        assert set(f.read().splitlines()) == words
+    assert not PTH.resplit_set_path.exists()
+
+
+def test_resume_after_matches_saved_before_checkpoint(
+        tmp_path, monkeypatch):
+    """a run stopped between saving matches and the checkpoint
+    doesn't repeat those matches when it's resumed"""
+
+    make_assets(tmp_path, monkeypatch, word_count=300)
+    monkeypatch.setattr(sandhi_splitter, "incremental_on", False)
+    full_run = run_splitter()
+
+    save_checkpoint = sandhi_splitter.save_checkpoint
+
+    def stop_at_the_last_checkpoint(processed_list, *args):
+        if len(processed_list) > 1:
+            raise KeyboardInterrupt
+        save_checkpoint(processed_list, *args)
+
+    monkeypatch.setattr(
+        sandhi_splitter, "save_checkpoint", stop_at_the_last_checkpoint)
+    with pytest.raises(KeyboardInterrupt):
+        run_splitter()
+
+    monkeypatch.setattr(sandhi_splitter, "save_checkpoint", save_checkpoint)
+    resumed_run = run_splitter(resume=True)
+
+    assert resumed_run == full_run
+
+
+def test_memo_gives_the_same_matches(tmp_path, monkeypatch):
+    """matches.tsv is the same with and without the memo"""
+
+    make_assets(tmp_path, monkeypatch, long_word_count=200)
+
+    monkeypatch.setattr(sandhi_splitter, "memo_on", False)
+    without_memo = run_splitter()
+
+    memo = CountingMemo()
+    monkeypatch.setattr(sandhi_splitter, "memo", memo)
+    monkeypatch.setattr(sandhi_splitter, "memo_on", True)
+    with_memo = run_splitter()
+
+    assert memo.replays_with_splits > 0
+    assert with_memo == without_memo
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -1,77 +1,43 @@
 import re
+
 from rich import print
 
+allowed_characters = set("aāiīuūeokgṅcjñṭḍṇtdnpbmyrlsvhḷṃṁ\n xfśṣǣæwqḥṛ")
+
+# each class of characters is replaced in one pass.
+# digits, tabs and some punctuation are removed
+remove_regex = re.compile(r"[\d\t'‘’`“”\"!?+*=~\ufeff–_]")
+# other punctuation becomes a space
+space_regex = re.compile(r"[.,;:§‡†$()\[\]{}/\\<>^\-—…]")
+# removed after double spaces are collapsed,
+# so the spaces around them stay as they are
+late_remove_regex = re.compile(r"[॰\u0325ใ\xad\xa0\u0306]")
 
-def clean_machine(text: str, niggahita="ṃ") -> str:
-    allowed_characters = "aāiīuūeokgṅcjñṭḍṇtdnpbmyrlsvhḷṃṁ\n xfśṣǣæwqḥṛ"
 
+def clean_machine(text: str, niggahita="ṃ") -> str:
     text = text.lower()
-    text = re.sub(r"\d", "", text)
-    text = re.sub(r"\t", "", text)
-    text = re.sub(r"\n", r" \n", text)
+    text = remove_regex.sub("", text)
+    text = space_regex.sub(" ", text)
+    text = text.replace("\n", " \n")
 
     if niggahita == "ṃ":
         text = text.replace("ṁ", "ṃ")
 
     text = text.replace(
-        ".", " ").replace(
-        ",", " ").replace(
-        ";", " ").replace(
-        ":", " ").replace(
-        "'", "").replace(
-        "‘", "").replace(
-        "’", "").replace(
-        "`", "").replace(
-        "`", "").replace(
-        "“", "").replace(
-        "”", "").replace(
-        '"', "").replace(
-        "!", "").replace(
-        "?", "").replace(
-        "+", "").replace(
-        "*", "").replace(
-        "=", "").replace(
-        "~", "").replace(
-        "﻿", "").replace(
-        "§", " ").replace(
-        "‡", " ").replace(
-        "†", " ").replace(
-        "$", " ").replace(
-        "(", " ").replace(
-        ")", " ").replace(
-        "[", " ").replace(
-        "]", " ").replace(
-        "{", " ").replace(
-        "}", " ").replace(
-        "/", " ").replace(
-        "\\", " ").replace(
-        "<", " ").replace(
-        ">", " ").replace(
-        "^", " ").replace(
-        "-", " ").replace(
-        "–", "").replace(
-        "—", " ").replace(
-        "_", "").replace(
-        "–", "").replace(
-        "…", " ").replace(
-        "  ", " ").replace(
-        "॰", "").replace(
         "ï", "i").replace(
         "ü", "u").replace(
-        "ạ", "a").replace(    
-        '̥', "").replace(
-        "'̆'", "").replace(
-        "ใ", "").replace(
-        "'̆'", "").replace(
-        "\xad", "").replace(
-        "\xa0", "").replace(
-        "\u0306", ""
-        )
-
-    text = re.sub("^ *", "", text)
-    text = re.sub(" $", "", text)
-
-    errors = set([c for c in text if c not in allowed_characters])
+        "ạ", "a").replace(
+        "  ", " ")
+    text = late_remove_regex.sub("", text)
+
+    # leading spaces, and one space at the end
+    text = text.lstrip(" ")
+    if text.endswith(" "):
+        text = text[:-1]
+    elif text.endswith(" \n"):
+        text = f"{text[:-2]}\n"
+
+    errors = set(text) - allowed_characters
 
     if len(errors) != 0:
         print(f"[bright_red]errors:{errors}", end=" ")
@@ -0,0 +1,118 @@
+"""A compact store of the word counts of every section of the corpus:
+a sorted vocabulary, and a uint32 matrix of word x column counts which
+is memory-mapped, so opening it is quick and processes share the pages.
+Usage:
+cf = load_corpus_frequency(PTH)
+cf.counts[cf.rows(["dhammo", "dhammaṃ"])].sum(axis=0)
+tipitaka_words = cf.words_in("tipitaka")
+A checkout without the store makes it from the word count csvs
+of an earlier corpus_counter run the first time it's loaded."""
+
+import csv
+import numpy as np
+
+from collections import Counter
+from rich import print
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from tools.cst_sc_text_sets import make_sc_text_set
+from tools.pali_text_files import sc_ebt_books
+from tools.paths import ProjectPaths
+
+
+class CorpusFrequency:
+    """words, the names of the count columns,
+    and the counts matrix, one row per word"""
+
+    def __init__(
+            self, words: List[str], columns: List[str], counts: np.ndarray):
+        self.words = words
+        self.columns = columns
+        self.counts = counts
+        self._vocab: Optional[Dict[str, int]] = None
+
+    @property
+    def vocab(self) -> Dict[str, int]:
+        """word: row, made on first use"""
+        if self._vocab is None:
+            self._vocab = {word: row for row, word in enumerate(self.words)}
+        return self._vocab
+
+    def rows(self, words: Iterable[str]) -> List[int]:
+        """the rows of the words in the corpus, skipping the rest"""
+        vocab = self.vocab
+        return [vocab[word] for word in words if word in vocab]
+
+    def column(self, name: str) -> np.ndarray:
+        """the counts of every word in one column"""
+        return self.counts[:, self.columns.index(name)]
+
+    def words_in(self, name: str) -> Set[str]:
+        """the words counted in one column"""
+        return {self.words[row] for row in np.flatnonzero(self.column(name))}
+
+
+def count_sc_ebts() -> Counter:
+    """word counts of the sutta central ebts"""
+    return Counter(make_sc_text_set(sc_ebt_books, return_list=True))
+
+
+def save_corpus_frequency(
+        pth: ProjectPaths,
+        column_counts: Dict[str, List[Tuple[str, int]]]
+) -> None:
+    """save the (word, count) lists of every column as one store"""
+
+    columns = list(column_counts)
+    words = sorted({
+        word for counts in column_counts.values() for word, count in counts})
+    vocab = {word: row for row, word in enumerate(words)}
+
+    matrix = np.zeros((len(words), len(columns)), dtype=np.uint32)
+    for column_number, counts in enumerate(column_counts.values()):
+        for word, count in counts:
+            matrix[vocab[word], column_number] = count
+
+    with open(pth.corpus_frequency_words_path, "w") as f:
+        f.write("\n".join(words))
+    with open(pth.corpus_frequency_columns_path, "w") as f:
+        f.write("\n".join(columns))
+    np.save(pth.corpus_frequency_counts_path, matrix)
+
+
+def save_corpus_frequency_from_csvs(pth: ProjectPaths) -> None:
+    """save the store from the word count csvs,
+    one column per csv, named after the file"""
+
+    column_counts: Dict[str, List[Tuple[str, int]]] = {}
+    for csv_path in sorted(pth.word_count_dir.glob("*.csv")):
+        with open(csv_path, newline="") as f:
+            column_counts[csv_path.stem] = [
+                (word, int(count))
+                for word, count in csv.reader(f, delimiter="\t")]
+
+    if "tipitaka" not in column_counts:
+        raise FileNotFoundError(
+            f"no word counts in {pth.word_count_dir}, "
+            "run frequency/corpus_counter.py")
+
+    # csvs from before the sutta central column
+    if "sc_ebts" not in column_counts:
+        column_counts["sc_ebts"] = count_sc_ebts().most_common()
+
+    save_corpus_frequency(pth, column_counts)
+
+
+def load_corpus_frequency(pth: ProjectPaths) -> CorpusFrequency:
+    """open the store, with the counts memory-mapped"""
+
+    if not pth.corpus_frequency_counts_path.exists():
+        print("[green]making corpus frequency from word count csvs")
+        save_corpus_frequency_from_csvs(pth)
+
+    with open(pth.corpus_frequency_words_path) as f:
+        words = f.read().split("\n")
+    with open(pth.corpus_frequency_columns_path) as f:
+        columns = f.read().split("\n")
+    counts = np.load(pth.corpus_frequency_counts_path, mmap_mode="r")
+    return CorpusFrequency(words, columns, counts)
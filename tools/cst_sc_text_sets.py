@@ -3,18 +3,29 @@ How to use: feed and a list of books and get a set in return.
 cst_test_set = make_cst_text_set(["an1", "an2"])
 sc_text_set = make_sc_text_set(["abh7"])
 sc_text_set = make_sc_text_set(["an1"], niggahita="ṁ")
+The clean words of each file are cached, so repeat calls only read the
+cache, until the file or clean_machine changes.
 """
 
+import hashlib
+import inspect
 import os
 import json
+import pickle
 
+from functools import lru_cache
+from pathlib import Path
 from rich import print
+from typing import List, Tuple
 
 from tools.clean_machine import clean_machine
 from tools.pali_text_files import sc_texts, cst_texts, bjt_texts
 from tools.pali_text_files import mula_books, all_books
 from tools.paths import ProjectPaths as PTH
 
+# clean words of each text file are cached in share/text_sets_cache
+text_sets_cache_on = True
+
 
 def make_cst_text_set(books: list, niggahita="ṃ", return_list=False) -> set:
     """Make a list of words in CST texts from a list of books.
@@ -29,10 +40,8 @@ def make_cst_text_set(books: list, niggahita="ṃ", return_list=False) -> set:
     words_list: list = []
 
     for book in cst_texts_list:
-        with open(PTH.cst_txt_dir.joinpath(book), "r") as f:
-            text_string = f.read()
-            text_string = clean_machine(text_string, niggahita=niggahita)
-            words_list.extend(text_string.split())
+        words_list.extend(
+            cached_words(PTH.cst_txt_dir.joinpath(book), niggahita))
 
     if return_list is True:
         return words_list
@@ -56,15 +65,9 @@ def make_sc_text_set(books: list, niggahita="ṃ", return_list=False) -> set:
 
     words_list: list = []
 
-    for root, dirs, files in sorted(os.walk(PTH.sc_dir)):
-        for file in files:
-            if file in sc_texts_list:
-                with open(os.path.join(root, file)) as f:
-                    # sc texts are json dictionaries
-                    sc_text_dict: dict = json.load(f)
-                    for title, text in sc_text_dict.items():
-                        clean_text = clean_machine(text, niggahita=niggahita)
-                        words_list.extend(clean_text.split())
+    for file, path in sc_file_paths():
+        if file in sc_texts_list:
+            words_list.extend(cached_words(path, niggahita))
 
     if return_list is True:
         return words_list
@@ -72,6 +75,68 @@ def make_sc_text_set(books: list, niggahita="ṃ", return_list=False) -> set:
         return set(words_list)
 
 
+@lru_cache(maxsize=None)
+def sc_file_paths() -> Tuple[Tuple[str, Path], ...]:
+    """(file name, path) of every sutta central file, in walk order.
+    The tree is only walked once."""
+
+    return tuple(
+        (file, Path(root).joinpath(file))
+        for root, dirs, files in sorted(os.walk(PTH.sc_dir))
+        for file in files)
+
+
+@lru_cache(maxsize=None)
+def clean_machine_hash() -> str:
+    """changes when clean_machine changes"""
+
+    with open(inspect.getfile(clean_machine), "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def clean_words(path: Path, niggahita: str) -> List[str]:
+    """all the clean words in a cst text or a sutta central json file"""
+
+    with open(path, "r") as f:
+        if path.suffix == ".json":
+            # sc texts are json dictionaries
+            sc_text_dict: dict = json.load(f)
+            words_list: list = []
+            for title, text in sc_text_dict.items():
+                clean_text = clean_machine(text, niggahita=niggahita)
+                words_list.extend(clean_text.split())
+            return words_list
+        else:
+            text_string = clean_machine(f.read(), niggahita=niggahita)
+            return text_string.split()
+
+
+def cached_words(path: Path, niggahita: str) -> List[str]:
+    """the clean words of a file from the cache,
+    or cleaned and cached if the file or clean_machine has changed"""
+
+    if text_sets_cache_on is False:
+        return clean_words(path, niggahita)
+
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size, clean_machine_hash())
+    cache_name = hashlib.md5(f"{path}{niggahita}".encode()).hexdigest()
+    cache_path = PTH.text_sets_cache_dir.joinpath(cache_name)
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, words_list = pickle.load(f)
+        if cached_key == key:
+            return words_list
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+
+    words_list = clean_words(path, niggahita)
+    with open(cache_path, "wb") as f:
+        pickle.dump((key, words_list), f)
+    return words_list
+
+
 def make_bjt_text_set(include):
 
     print(f"[green]{'making buddhajayanti text set':<35}", end="")
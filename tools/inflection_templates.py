@@ -0,0 +1,76 @@
+"""Parse the inflection templates once and expand stems with them.
+Usage:
+templates = load_inflection_templates(db_session)
+for inflection, grammar in templates["a masc"].expand("dhamm"):
+    ..."""
+
+import json
+
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from db.models import InflectionTemplates
+
+
+class TemplateCell(NamedTuple):
+    grammar: str  # the title, e.g. "masc nom sg"
+    endings: Tuple[str, ...]  # "" is an empty cell
+
+
+class TemplateRow(NamedTuple):
+    heading: str
+    cells: Tuple[TemplateCell, ...]
+
+
+class InflectionTemplate(NamedTuple):
+    pattern: str
+    like: str
+    headings: Tuple[str, ...]
+    rows: Tuple[TemplateRow, ...]
+    endings: Tuple[Tuple[str, str], ...]  # every (ending, grammar) in order
+
+    def expand(self, stem: str) -> Iterator[Tuple[str, str]]:
+        """all the (inflection, grammar) of stem, in table order"""
+        for ending, grammar in self.endings:
+            yield f"{stem}{ending}", grammar
+
+
+def parse_template(pattern: str, like: str, data: str) -> InflectionTemplate:
+    """parse the json data of one template"""
+
+    # data is a nest of lists
+    # list[] table
+    # list[[]] row
+    # list[[[]]] cell
+    # row 0 is the top header
+    # column 0 is the grammar header
+    # odd columns > 0 are inflections
+    # even columns > 0 are grammar info
+
+    table_data: List[list] = json.loads(data)
+
+    headings = tuple(
+        cell_data[0] for column_number, cell_data
+        in enumerate(table_data[0]) if column_number % 2 == 1)
+
+    rows: List[TemplateRow] = []
+    endings: List[Tuple[str, str]] = []
+    for row_data in table_data[1:]:
+        cells: List[TemplateCell] = []
+        for column_number in range(1, len(row_data), 2):
+            grammar: str = row_data[column_number + 1][0]
+            cell = TemplateCell(grammar, tuple(row_data[column_number]))
+            cells.append(cell)
+            endings.extend(
+                (ending, grammar) for ending in cell.endings if ending != "")
+        rows.append(TemplateRow(row_data[0][0], tuple(cells)))
+
+    return InflectionTemplate(
+        pattern, like, headings, tuple(rows), tuple(endings))
+
+
+def load_inflection_templates(db_session) -> Dict[str, InflectionTemplate]:
+    """parse every template in the db once, keyed by pattern"""
+
+    return {
+        t.pattern: parse_template(t.pattern, t.like, t.data)
+        for t in db_session.query(InflectionTemplates).all()}
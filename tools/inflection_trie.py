@@ -0,0 +1,111 @@
+"""A compact trie of inflections, for finding every inflection
+a word starts or ends with in a single walk."""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Tuple
+
+# node flags
+WORD = 1  # the path to this node is a word
+NEXT_WORD = 2  # the path plus one more letter is a word
+
+
+class InflectionTrie:
+    """A prefix trie of words, or a suffix trie if reverse=True.
+    Nodes are numbers and edges are kept in two sorted arrays,
+    so a trie of all inflections is small and quick to pickle.
+    Usage:
+    prefix_trie = InflectionTrie(all_inflections_set)
+    suffix_trie = InflectionTrie(all_inflections_set, reverse=True)
+    prefix_trie.walk("dhammavasena")"""
+
+    def __init__(self, words: Iterable[str], reverse: bool = False):
+        self.reverse = reverse
+
+        if reverse:
+            words = sorted(word[::-1] for word in words)
+        else:
+            words = sorted(words)
+
+        # build the trie from the sorted words, one path at a time.
+        # each edge key is the parent node and the letter.
+        keys: List[int] = []
+        children: List[int] = []
+        flags = bytearray(1)
+        path = [0]
+        previous = ""
+
+        for word in words:
+            common = 0
+            while (
+                common < len(word) and
+                common < len(previous) and
+                word[common] == previous[common]
+            ):
+                common += 1
+            del path[common + 1:]
+
+            for letter in word[common:]:
+                node = len(flags)
+                flags.append(0)
+                keys.append(self._key(path[-1], letter))
+                children.append(node)
+                path.append(node)
+
+            flags[path[-1]] |= WORD
+            if len(path) > 1:
+                flags[path[-2]] |= NEXT_WORD
+            previous = word
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = array("Q", (keys[i] for i in order))
+        self.children = array("I", (children[i] for i in order))
+        self.flags = flags
+
+    @staticmethod
+    def _key(node: int, letter: str) -> int:
+        return (node << 21) | ord(letter)
+
+    def walk(self, word: str) -> List[Tuple[int, int]]:
+        """All the (length, flags) of the prefixes of word in the trie,
+        or of the suffixes if it's a suffix trie, shortest first.
+        Length 0 is the empty string."""
+
+        keys = self.keys
+        keys_len = len(keys)
+        flags = self.flags
+        node = 0
+        found = []
+
+        if flags[node]:
+            found.append((0, flags[node]))
+
+        if self.reverse:
+            word = word[::-1]
+
+        for length, letter in enumerate(word, start=1):
+            key = self._key(node, letter)
+            i = bisect_left(keys, key)
+            if i == keys_len or keys[i] != key:
+                break
+            node = self.children[i]
+            if flags[node]:
+                found.append((length, flags[node]))
+
+        return found
+
+    def occurs_in(self, text: str) -> bool:
+        """True if any word in the trie occurs anywhere in text."""
+
+        for i in range(len(text)):
+            if self.reverse:
+                part = text[:len(text) - i]
+            else:
+                part = text[i:]
+            for length, flags in self.walk(part):
+                if flags & WORD:
+                    return True
+        return False
+
+    def __len__(self):
+        return len(self.flags)
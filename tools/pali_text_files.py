@@ -7890,6 +7890,18 @@ ebts = [
     "s0514m.mul.txt"
 ]
 
+# sutta central books of the ebts
+sc_ebt_books = [
+    "vin1", "vin2", "vin3", "vin4", "vin5",
+    "dn1", "dn2", "dn3",
+    "mn1", "mn2", "mn3",
+    "sn1", "sn2", "sn3", "sn4", "sn5",
+    "an1", "an2", "an3", "an4", "an5",
+    "an6", "an7", "an8", "an9", "an10", "an11",
+    "kn1", "kn2", "kn3", "kn4", "kn5",
+    "kn8", "kn9",
+]
+
 mula_books = [
     "vin1", "vin2", "vin3", "vin4", "vin5",
     "dn1", "dn2", "dn3",
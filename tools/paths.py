@@ -86,6 +86,7 @@ class ProjectPaths():
     zip_dir: Path = Path("exporter/share")
     zip_path: Path = Path("exporter/share/dpd.zip")
     mdict_mdx_path: Path = Path("exporter/share/dpd-mdict.mdx")
+    mdict_mdd_path: Path = Path("exporter/share/dpd-mdict.mdd")
     grammar_dict_zip_path: Path = Path("exporter/share/dpd-grammar.zip")
     grammar_dict_mdict_path: Path = Path(
         "exporter/share/dpd-grammar-mdict.mdx")
@@ -170,6 +171,16 @@ class ProjectPaths():
         "frequency/output/raw_text/ebts.txt")
     ebt_word_count_path: Path = Path(
         "frequency/output/word_count/ebts.csv")
+    sc_ebt_word_count_path: Path = Path(
+        "frequency/output/word_count/sc_ebts.csv")
+    corpus_frequency_dir: Path = Path(
+        "frequency/output/corpus_frequency")
+    corpus_frequency_words_path: Path = Path(
+        "frequency/output/corpus_frequency/words.txt")
+    corpus_frequency_columns_path: Path = Path(
+        "frequency/output/corpus_frequency/columns.txt")
+    corpus_frequency_counts_path: Path = Path(
+        "frequency/output/corpus_frequency/counts.npy")
 
     # /grammar_dict/output
     grammar_dict_output_dir: Path = Path("grammar_dict/output")
@@ -214,12 +225,20 @@ class ProjectPaths():
         "sandhi/assets/unmatched_set")
     all_inflections_set_path: Path = Path(
         "sandhi/assets/all_inflections_set")
+    inflections_prefix_trie_path: Path = Path(
+        "sandhi/assets/inflections_prefix_trie")
+    inflections_suffix_trie_path: Path = Path(
+        "sandhi/assets/inflections_suffix_trie")
     text_set_path: Path = Path(
         "sandhi/assets/text_set")
     neg_inflections_set_path: Path = Path(
         "sandhi/assets/neg_inflections_set")
     matches_dict_path: Path = Path(
         "sandhi/assets/matches_dict")
+    resplit_set_path: Path = Path(
+        "sandhi/assets/resplit_set")
+    sandhi_assets_hash_path: Path = Path(
+        "sandhi/assets/sandhi_assets_hash")
 
     # /sandhi/output
     sandhi_output_dir: Path = Path("sandhi/output/")
@@ -239,6 +258,7 @@ class ProjectPaths():
     sandhi_dict_df_path: Path = Path(
         "sandhi/output/sandhi_dict_df.tsv")
     sandhi_timer_path: Path = Path("sandhi/output/timer.tsv")
+    sandhi_checkpoint_path: Path = Path("sandhi/output/checkpoint.tsv")
     rule_counts_path: Path = Path(
         "sandhi/output/rule_counts/rule_counts.tsv")
 
@@ -284,6 +304,8 @@ class ProjectPaths():
         "share/inflections_to_translit.json")
     inflections_from_translit_json_path: Path = Path(
         "share/inflections_from_translit.json")
+    dpd_render_cache_path: Path = Path("share/dpd_render_cache")
+    text_sets_cache_dir: Path = Path("share/text_sets_cache")
 
     # /tbw
     tbw_output_dir: Path = Path("tbw/output/")
@@ -327,6 +349,8 @@ class ProjectPaths():
             cls.raw_text_dir,
             cls.freq_html_dir,
             cls.word_count_dir,
+            cls.corpus_frequency_dir,
+            cls.text_sets_cache_dir,
             cls.tbw_output_dir,
             cls.temp_dir,
             cls.sandhi_output_dir,
@@ -13,7 +13,7 @@ import html
 import multiprocessing
 from pathlib import Path
 import datetime
-from typing import List, TypedDict, Optional
+from typing import Dict, Iterable, List, Tuple, TypedDict, Optional
 import shutil
 from zipfile import ZipFile
 import struct
@@ -140,6 +140,7 @@ class StarDictPaths(TypedDict):
     idx_path: Optional[Path]
     dic_path: Optional[Path]
     syn_path: Optional[Path]
+    res_dir: Optional[Path]
 
 
 def new_stardict_paths(zip_path: Path):
@@ -152,6 +153,7 @@ def new_stardict_paths(zip_path: Path):
         idx_path=None,
         dic_path=None,
         syn_path=None,
+        res_dir=None,
     )
 
 
@@ -566,14 +568,20 @@ def write_ifo(ifo: StarDictIfo, paths: StarDictPaths):
 class WriteResult(TypedDict):
     idx_size: Optional[int]
     syn_count: Optional[int]
+    word_count: Optional[int]
 
 
-def write_words(words: List[DictEntry], paths: StarDictPaths) -> WriteResult:
-    """Writes .idx, .dict.dz, .syn.dz"""
+def write_words(words: Iterable[DictEntry], paths: StarDictPaths) -> WriteResult:
+    """Writes .idx, .dict.dz, .syn.dz, with the .idx and .syn sorted
+
+    words can be any iterable, e.g. a generator. Each definition is written
+    to the .dict.dz as it arrives, and only the .idx and .syn records are
+    kept in memory until the end."""
 
     res = WriteResult(
         idx_size=None,
-        syn_count=None
+        syn_count=None,
+        word_count=None,
     )
 
     if paths['idx_path'] is None or paths['dic_path'] is None:
@@ -582,10 +590,13 @@ def write_words(words: List[DictEntry], paths: StarDictPaths) -> WriteResult:
 
     idx: List[IdxEntry] = []
 
+    # (synonym, index of the word in the .idx)
+    syn: List[Tuple[str, int]] = []
+
     with idzip.IdzipFile(f"{paths['dic_path']}", "wb") as f:
         offset_begin = 0
         data_size = 0
-        for w in words:
+        for n, w in enumerate(words):
             d = bytes(w['definition_html'], 'utf-8')
             f.write(d)
 
@@ -599,35 +610,60 @@ def write_words(words: List[DictEntry], paths: StarDictPaths) -> WriteResult:
 
             offset_begin += data_size
 
-    with open(paths['idx_path'], 'wb') as f:
-        for i in idx:
-            d = bytes(f"{i['word']}\0", "utf-8")
-            f.write(d)
-            d = struct.pack(">II", i['offset_begin'], i['data_size'])
-            f.write(d)
+            if paths['syn_path'] is not None:
+                syn.extend((s, n) for s in w['synonyms'])
 
+    res['word_count'] = len(idx)
+
+    # readers binary search the .idx and .syn, so both must be sorted,
+    # and the .syn must point to the sorted .idx positions
+    order = sorted(
+        range(len(idx)), key=lambda n: stardict_sort_key(idx[n]['word']))
+    idx = [idx[n] for n in order]
+
+    position = [0] * len(order)
+    for sorted_n, n in enumerate(order):
+        position[n] = sorted_n
+
+    syn = sorted(
+        ((s, position[n]) for s, n in syn),
+        key=lambda x: (stardict_sort_key(x[0]), x[1]))
+
+    write_idx(idx, paths)
     res['idx_size'] = paths['idx_path'].stat().st_size
 
     if paths['syn_path'] is not None:
-        res['syn_count'] = 0
+        write_syn(syn, paths)
+        res['syn_count'] = len(syn)
 
-        with idzip.IdzipFile(f"{paths['syn_path']}", "wb") as f:
-            for n, w in enumerate(words):
+    return res
 
-                # if res['syn_count'] is not None:
-                #     n = int(res['syn_count'])
-                #     n += len(w['synonyms'])
-                #     res['syn_count'] = n
-                if res['syn_count'] is not None:
-                    res['syn_count'] += len(w['synonyms'])
 
-                for s in w['synonyms']:
-                    d = bytes(f"{s}\0", "utf-8")
-                    f.write(d)
-                    d = struct.pack(">I", n)
-                    f.write(d)
+def stardict_sort_key(word: str) -> Tuple[bytes, bytes]:
+    """The order of StarDict's stardict_strcmp:
+    g_ascii_strcasecmp, then strcmp, both on the utf-8 bytes.
+    bytes.lower() only changes ASCII letters, like g_ascii_strcasecmp."""
+
+    b = word.encode("utf-8")
+    return b.lower(), b
 
-    return res
+
+def write_idx(idx: List[IdxEntry], paths: StarDictPaths) -> None:
+    with open(paths['idx_path'], 'wb') as f:
+        for i in idx:
+            d = bytes(f"{i['word']}\0", "utf-8")
+            f.write(d)
+            d = struct.pack(">II", i['offset_begin'], i['data_size'])
+            f.write(d)
+
+
+def write_syn(syn: List[Tuple[str, int]], paths: StarDictPaths) -> None:
+    with idzip.IdzipFile(f"{paths['syn_path']}", "wb") as f:
+        for s, n in syn:
+            d = bytes(f"{s}\0", "utf-8")
+            f.write(d)
+            d = struct.pack(">I", n)
+            f.write(d)
 
 
 def write_stardict_zip(paths: StarDictPaths):
@@ -642,11 +678,17 @@ def write_stardict_zip(paths: StarDictPaths):
                 # NOTE .parent to create a top level folder in .zip
                 z.write(p, p.relative_to(paths['unzipped_dir'].parent))
 
+        # shared resource files, e.g. css and js linked from every entry
+        if paths['res_dir'] is not None:
+            for p in sorted(paths['res_dir'].iterdir()):
+                z.write(p, p.relative_to(paths['unzipped_dir'].parent))
 
-def export_words_as_stardict_zip(words: List[DictEntry],
+
+def export_words_as_stardict_zip(words: Iterable[DictEntry],
                                  ifo: StarDictIfo,
                                  zip_path: Path,
-                                 icon_path: Optional[Path] = None):
+                                 icon_path: Optional[Path] = None,
+                                 resources: Optional[Dict[str, bytes]] = None):
 
     name = zip_path.name.replace('.zip', '')
     # No spaces in the filename and dict files.
@@ -666,6 +708,15 @@ def export_words_as_stardict_zip(words: List[DictEntry],
         zip_icon_path = unzipped_dir.joinpath(f"{name}{ext}")
         shutil.copy(icon_path, zip_icon_path)
 
+    # StarDict clients look up files linked from entries in the res folder
+    zip_res_dir = None
+
+    if resources:
+        zip_res_dir = unzipped_dir.joinpath("res")
+        zip_res_dir.mkdir()
+        for file_name, data in resources.items():
+            zip_res_dir.joinpath(file_name).write_bytes(data)
+
     paths = StarDictPaths(
         zip_path=zip_path,
         unzipped_dir=unzipped_dir,
@@ -674,15 +725,16 @@ def export_words_as_stardict_zip(words: List[DictEntry],
         idx_path=unzipped_dir.joinpath(f"{name}.idx"),
         dic_path=unzipped_dir.joinpath(f"{name}.dict.dz"),
         syn_path=unzipped_dir.joinpath(f"{name}.syn.dz"),
+        res_dir=zip_res_dir,
     )
 
     ifo['version'] = '3.0.0'
-    ifo['wordcount'] = f"{len(words)}"
     ifo['sametypesequence'] = 'h'
     ifo['date'] = datetime.datetime.utcnow().replace(microsecond=0).isoformat()
 
     res = write_words(words, paths)
 
+    ifo['wordcount'] = f"{res['word_count']}"
     ifo['idxoffsetbits'] = "32"
     ifo['idxfilesize'] = f"{res['idx_size']}"
     ifo['synwordcount'] = f"{res['syn_count']}"
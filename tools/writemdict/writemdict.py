@@ -36,9 +36,12 @@ import locale
 import struct
 import zlib
 import operator
+import os
 import sys
 import datetime
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ripemd128 import ripemd128
 from html import escape
 from pureSalsa20 import Salsa20
@@ -172,12 +175,14 @@ class MDictWriter(object):
                  register_by=None,
                  user_email=None,
                  user_device_id=None,
-                 is_mdd=False):
+                 is_mdd=False,
+                 compression_threads=None):
         """
         Prepares the records. A subsequent call to write() writes
         the mdx or mdd file.
 
-        d is a dictionary. The keys should be (unicode) strings. If used for an mdx
+        d is a dictionary, or an iterable of (key, value) pairs, e.g. a
+          generator. The keys should be (unicode) strings. If used for an mdx
           file (the parameter is_mdd is False), then the values should also be
           (unicode) strings, containing HTML snippets. If used to write an mdd
           file (the parameter is_mdd is True), then the values should be binary
@@ -230,9 +235,14 @@ class MDictWriter(object):
         is_mdd is a boolean specifying whether the file written will be an mdx file
           or an mdd file. By default this is False, meaning that an mdd file will
           be written.
+
+        compression_threads is the number of threads used to compress the key
+          and record blocks. The blocks are independent and zlib releases the
+          GIL, so they compress in parallel; they are reassembled in order, so
+          the output is identical to compressing them one by one. By default
+          this is the number of CPUs. Use 1 to compress in a single thread.
         """
 
-        self._num_entries = len(d)
         self._title = title
         self._description = description
         self._block_size = block_size
@@ -246,6 +256,9 @@ class MDictWriter(object):
         self._user_device_id = user_device_id
         self._compression_type = compression_type
         self._is_mdd = is_mdd
+        if compression_threads is None:
+            compression_threads = os.cpu_count() or 1
+        self._compression_threads = compression_threads
 
         # encoding is set to the string used in the mdx header.
         # python_encoding is passed on to the python .encode()
@@ -365,12 +378,19 @@ class MDictWriter(object):
         if isinstance(d, dict):
             items = list(d.items())
         else:
+            # the entries have to be sorted, so a generator is read in
+            # whole here. dpd's mdict_items releases its lists as it goes
             items = list(d)
         items.sort(key=functools.cmp_to_key(mdict_cmp))
+        self._num_entries = len(items)
 
         self._offset_table = []
         offset = 0
-        for key, record in items:
+        for ind in range(len(items)):
+            key, record = items[ind]
+            # drop each record once it is encoded, so the whole dictionary
+            # isn't held both as str and as bytes
+            items[ind] = None
             key_enc = key.encode(self._python_encoding)
             key_null = (key+"\0").encode(self._python_encoding)
             key_len = len(key_enc) // self._encoding_length
@@ -401,7 +421,7 @@ class MDictWriter(object):
 
         this_block_start = 0
         cur_size = 0
-        blocks = []
+        block_slices = []
         for ind in range(len(self._offset_table)+1):
             if ind != len(self._offset_table):
                 t = self._offset_table[ind]
@@ -421,13 +441,24 @@ class MDictWriter(object):
             else:
                 flush = False
             if flush:
-                blocks.append(block_type(
-                    self._offset_table[this_block_start:ind], self._compression_type, self._version))
+                block_slices.append((this_block_start, ind))
                 cur_size = 0
                 this_block_start = ind
             if t is not None:  # mentally add this entry to list of things
                 cur_size += block_type._len_block_entry(t)
-        return blocks
+
+        def make_block(block_slice):
+            start, end = block_slice
+            return block_type(
+                self._offset_table[start:end], self._compression_type, self._version)
+
+        # Compressing the blocks is independent, so it can be done in parallel.
+        # map() returns the blocks in order.
+        if self._compression_threads > 1 and len(block_slices) > 1:
+            with ThreadPoolExecutor(self._compression_threads) as executor:
+                return list(executor.map(make_block, block_slices))
+        else:
+            return [make_block(block_slice) for block_slice in block_slices]
 
     def _build_key_blocks(self):
         # Sets self._key_blocks to a list of _MdxKeyBlocks.